@@ -1,19 +1,26 @@
 """Main bot - NO Mean Reversion Trading Bot for Polymarket."""
 
 import asyncio
+import heapq
+import logging
+import queue
 import signal
 import sys
 import time
-from datetime import datetime
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from config import config
-from polymarket_client import PolymarketClient
-from spike_detector import SpikeDetector
+from polymarket_client import Market, PolymarketClient
+from spike_detector import SpikeDetector, SpikeSignal
 from strategy import MeanReversionStrategy
 from position_manager import PositionManager
-from orderbook import OrderbookAnalyzer, OrderTracker
+from orderbook import OrderbookAnalyzer, OrderRecord, OrderTracker
 from metrics import MetricsCollector, SignalOutcome
 
+log = logging.getLogger("bot")
+
 
 class MeanReversionBot:
     """
@@ -24,6 +31,11 @@ class MeanReversionBot:
     betting on mean reversion.
     """
 
+    # Log templates for lines emitted every pass; logging only fills
+    # them in when a handler actually consumes the record
+    _UPDATE_FMT = "Update #%d"
+    _ORDER_STATUS_FMT = "  %.8s... | $%.2f @ %.2f | Age: %.0fs"
+
     def __init__(self):
         self.client = PolymarketClient()
         self.detector = SpikeDetector(self.client)
@@ -32,229 +44,357 @@ class MeanReversionBot:
         self.orderbook_analyzer = OrderbookAnalyzer()
         self.order_tracker = OrderTracker()
         self.metrics = MetricsCollector()
-        self.running = False
-        self.scan_interval = 30  # seconds between scans
-
-        # Track signals for follow-up price checks
-        self._pending_signal_checks: list[dict] = []
+        self._stop_event = asyncio.Event()
+        self.market_refresh_interval = 300  # seconds between market list refreshes
+        self.housekeeping_interval = 30  # seconds between baseline/position updates
+        self.order_check_interval = 5  # seconds between open order checks
+
+        # Markets we're watching, keyed by YES token
+        self._markets: dict[str, Market] = {}
+        self._markets_task: Optional[asyncio.Task] = None
+        self._tasks: list[asyncio.Task] = []
+
+        # YES tokens with price updates since the last baseline update
+        self._dirty_tokens: set[str] = set()
+
+        # Follow-up price checks for past signals, as a min-heap of
+        # (due_at, market_id, token_id, signal_timestamp, minutes)
+        # (restored from the previous run, if any)
+        self._pending_signal_checks: list[tuple[float, str, str, float, int]] = (
+            self.metrics.load_pending_checks()
+        )
+        heapq.heapify(self._pending_signal_checks)
+        self.signal_check_minutes = (5, 15, 60)
+        # Whether the checks changed since they were last saved
+        self._pending_checks_dirty = False
 
     async def start(self):
         """Start the bot."""
-        print("\n" + "=" * 60)
+        log.info("=" * 60)
         if config.dry_run:
-            print("NO Mean Reversion Bot [DRY RUN MODE]")
-            print("=" * 60)
-            print("*** NO REAL TRADES WILL BE PLACED ***")
+            log.info("NO Mean Reversion Bot [DRY RUN MODE]")
+            log.info("=" * 60)
+            log.info("*** NO REAL TRADES WILL BE PLACED ***")
         else:
-            print("NO Mean Reversion Bot [LIVE MODE]")
-            print("=" * 60)
-        print(f"Strategy: Buy NO when YES spikes >{config.min_spike_threshold:.0%}")
-        print(f"Max position: ${config.max_position_size}")
-        print(f"Max positions: {config.max_open_positions}")
-        print(f"Take profit: {config.take_profit_pct:.0%}")
-        print(f"Stop loss: {config.stop_loss_pct:.0%}")
-        print("=" * 60)
-
-        # Show historical analytics
-        self.metrics.print_analytics()
-
-        # Show parameter suggestions
-        suggestions = self.metrics.get_parameter_suggestions()
-        if suggestions:
-            print("\nParameter Suggestions (based on historical data):")
-            for param, info in suggestions.items():
-                print(f"  {param}: {info.get('reason', '')}")
-            print()
+            log.info("NO Mean Reversion Bot [LIVE MODE]")
+            log.info("=" * 60)
+        log.info("Strategy: Buy NO when YES spikes >%.0f%%", config.min_spike_threshold * 100)
+        log.info("Max position: $%s", config.max_position_size)
+        log.info("Max positions: %s", config.max_open_positions)
+        log.info("Take profit: %.0f%%", config.take_profit_pct * 100)
+        log.info("Stop loss: %.0f%%", config.stop_loss_pct * 100)
+        log.info("=" * 60)
 
         await self.client.connect()
-        self.running = True
 
         # Set up graceful shutdown
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, lambda: asyncio.create_task(self.stop()))
+            loop.add_signal_handler(sig, self._request_stop)
 
-        await self.run_loop()
+        # Nothing else can run without a market list, so keep trying
+        if not await self._initial_refresh():
+            await self.stop()
+            return
+
+        await self.client.start_feed()
+        for task in self.client.feed_tasks:
+            task.add_done_callback(self._on_feed_task_done)
+
+        self._markets_task = asyncio.create_task(
+            self._refresh_markets_periodically(self.market_refresh_interval)
+        )
+        self._tasks = [
+            self._markets_task,
+            asyncio.create_task(self._housekeeping_loop()),
+            asyncio.create_task(self._order_loop()),
+        ]
+
+        try:
+            await self.run_loop()
+        finally:
+            await self.stop()
+
+    def _request_stop(self):
+        """Signal handler - ask every loop to exit."""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+
+        # Wake up run_loop so it can exit
+        self.client.price_events.put_nowait(None)
+
+    def _on_feed_task_done(self, task: asyncio.Task):
+        """The market feed only ends at shutdown - stop if it dies early.
+
+        Without it run_loop would wait on price events forever while the
+        other loops keep running, so exit and let the supervisor restart us.
+        """
+        if task.cancelled() or self._stop_event.is_set():
+            return
+        log.error("Market feed task %s stopped unexpectedly: %r", task.get_name(), task.exception())
+        self._request_stop()
 
     async def stop(self):
         """Stop the bot gracefully."""
-        print("\nShutting down...")
+        log.info("Shutting down...")
+        self._stop_event.set()
         self.metrics.print_analytics()
-        self.running = False
+        for task in self._tasks:
+            task.cancel()
         await self.client.close()
+        self._save_pending_checks()
+        self.metrics.close()  # Writes everything queued, checks included
+
+    async def _wait_for_stop(self, timeout: float):
+        """Sleep for up to timeout seconds, returning early on shutdown."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
     async def run_loop(self):
-        """Main bot loop."""
-        iteration = 0
-        last_analytics_print = time.time()
+        """Main bot loop - react to live price updates from the market feed."""
+        events = self.client.price_events
 
-        while self.running:
+        while update := await events.get():
             try:
-                iteration += 1
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                print(f"\n[{timestamp}] Scan #{iteration}")
+                # Drain whatever queued up behind this update, keeping
+                # only the latest price per token
+                updates = {update.token_id: update}
+                while not events.empty():
+                    queued = events.get_nowait()
+                    if queued is None:
+                        events.put_nowait(None)  # Exit after this batch
+                        break
+                    updates[queued.token_id] = queued
+
+                self._dirty_tokens.update(updates)
+
+                signals = []
+                for token_id, latest in updates.items():
+                    market = self._markets.get(token_id)
+                    if market is None:
+                        continue
+
+                    sig = await self.detector.check_single(market, latest)
+                    if sig:
+                        signals.append(sig)
+
+                if signals:
+                    log.info("Found %d spike signals!", len(signals))
+                    await self._process_signals(signals)
 
-                # 1. Fetch active markets
-                markets = await self.client.get_active_markets()
-                print(f"  Monitoring {len(markets)} markets")
+            except Exception as e:
+                log.exception("Error in main loop: %s", e)
+
+    async def _process_signals(self, signals: list[SpikeSignal]):
+        """Evaluate spike signals and place (or simulate) trades."""
+        # Fetch all NO orderbooks concurrently
+        books = await asyncio.gather(
+            *(self.client.get_orderbook(s.token_id_no) for s in signals),
+            return_exceptions=True,
+        )
+        orderbooks = dict(zip([s.token_id_no for s in signals], books))
+
+        for sig in signals:
+            no_orderbook = orderbooks[sig.token_id_no]
+            if isinstance(no_orderbook, Exception):
+                log.warning("Error fetching orderbook: %s", no_orderbook)
+                no_orderbook = {"bids": [], "asks": []}
+            # Shares the strategy's cache, so evaluate() below reuses it
+            analysis = self.strategy.analyze_orderbook(sig.token_id_no, no_orderbook)
+
+            # Determine outcome before we evaluate
+            outcome = SignalOutcome.TRADED
+            trade_id = None
+
+            # Skip if we can't open more positions
+            if not self.positions.can_open_position(sig.token_id_no):
+                outcome = SignalOutcome.SKIPPED_MAX_POSITIONS
+            elif analysis.is_thin:
+                # May still trade but note it
+                pass
 
-                # 2. Update baseline prices
-                await self.detector.update_baselines(markets)
+            # Evaluate signal with orderbook data
+            decision = self.strategy.evaluate(sig, no_orderbook)
+
+            if decision and decision.size > 0 and outcome == SignalOutcome.TRADED:
+                urgency_str = "unknown"
+                queue_pos = 0
+                if decision.order_params:
+                    urgency_str = decision.order_params.urgency.value
+                    queue_pos = decision.order_params.expected_queue_position
+
+                if config.dry_run:
+                    # Dry run - log but don't place order
+                    log.info("[DRY RUN] WOULD TRADE: %s", decision.reason)
+                    log.info("  Market: %.50s...", sig.market.question)
+                    log.info("  Size: $%.2f @ %.2f", decision.size, decision.limit_price)
+                    log.info("  Urgency: %s", urgency_str)
+                    log.info("  Queue position: ~%s", queue_pos)
+
+                    # Generate fake order ID for tracking
+                    trade_id = f"dry-run-{uuid.uuid4().hex[:8]}"
+
+                    # Still record for analytics
+                    self.metrics.record_trade_entry(
+                        trade_id=trade_id,
+                        market_id=sig.market.condition_id,
+                        market_question=sig.market.question,
+                        signal_spike_pct=sig.spike_pct,
+                        entry_price=decision.limit_price,
+                        entry_size=decision.size,
+                        order_urgency=urgency_str,
+                        queue_position=queue_pos,
+                    )
+                else:
+                    # Live mode - place real order
+                    log.info("TRADE: %s", decision.reason)
+                    log.info("  Market: %.50s...", sig.market.question)
+                    log.info("  Urgency: %s", urgency_str)
+                    log.info("  Queue position: ~%s", queue_pos)
+
+                    order_id = await self.client.place_order(
+                        token_id=decision.token_id,
+                        side=decision.side,
+                        size=decision.size,
+                        price=decision.limit_price,
+                    )
 
-                # 3. Check and cancel stale orders
-                await self._manage_open_orders()
+                    if order_id:
+                        trade_id = order_id
 
-                # 4. Update pending signal checks (see if spikes reverted)
-                await self._check_signal_outcomes()
+                        self.order_tracker.add_order(
+                            order_id=order_id,
+                            token_id=decision.token_id,
+                            price=decision.limit_price,
+                            size=decision.size,
+                            params=decision.order_params,
+                        )
 
-                # 5. Scan for spike opportunities
-                signals = await self.detector.scan_markets(markets)
+                        self.positions.add_position(
+                            token_id=decision.token_id,
+                            market_question=sig.market.question,
+                            entry_price=decision.limit_price,
+                            size=decision.size,
+                            order_id=order_id,
+                        )
 
-                if signals:
-                    print(f"  Found {len(signals)} spike signals!")
-
-                    for sig in signals:
-                        # Get NO orderbook for analysis
-                        no_orderbook = await self.client.get_orderbook(sig.token_id_no)
-                        analysis = self.orderbook_analyzer.analyze(no_orderbook)
-
-                        # Determine outcome before we evaluate
-                        outcome = SignalOutcome.TRADED
-                        trade_id = None
-
-                        # Skip if we can't open more positions
-                        if not self.positions.can_open_position(sig.token_id_no):
-                            outcome = SignalOutcome.SKIPPED_MAX_POSITIONS
-                        elif analysis.is_thin:
-                            # May still trade but note it
-                            pass
-
-                        # Evaluate signal with orderbook data
-                        decision = self.strategy.evaluate(sig, no_orderbook)
-
-                        if decision and decision.size > 0 and outcome == SignalOutcome.TRADED:
-                            urgency_str = "unknown"
-                            queue_pos = 0
-                            if decision.order_params:
-                                urgency_str = decision.order_params.urgency.value
-                                queue_pos = decision.order_params.expected_queue_position
-
-                            if config.dry_run:
-                                # Dry run - log but don't place order
-                                print(f"\n  [DRY RUN] WOULD TRADE: {decision.reason}")
-                                print(f"    Market: {sig.market.question[:50]}...")
-                                print(f"    Size: ${decision.size:.2f} @ {decision.limit_price:.2f}")
-                                print(f"    Urgency: {urgency_str}")
-                                print(f"    Queue position: ~{queue_pos}")
-
-                                # Generate fake order ID for tracking
-                                import uuid
-                                trade_id = f"dry-run-{uuid.uuid4().hex[:8]}"
-
-                                # Still record for analytics
-                                self.metrics.record_trade_entry(
-                                    trade_id=trade_id,
-                                    market_id=sig.market.condition_id,
-                                    market_question=sig.market.question,
-                                    signal_spike_pct=sig.spike_pct,
-                                    entry_price=decision.limit_price,
-                                    entry_size=decision.size,
-                                    order_urgency=urgency_str,
-                                    queue_position=queue_pos,
-                                )
-
-                                # Track simulated position for outcome monitoring
-                                self._pending_signal_checks.append({
-                                    "market_id": sig.market.condition_id,
-                                    "token_id": sig.market.token_id_yes,
-                                    "timestamp": sig.timestamp,
-                                    "checks_remaining": [5, 15, 60],
-                                    "trade_id": trade_id,
-                                    "entry_no_price": decision.limit_price,
-                                })
-                            else:
-                                # Live mode - place real order
-                                print(f"\n  TRADE: {decision.reason}")
-                                print(f"    Market: {sig.market.question[:50]}...")
-                                print(f"    Urgency: {urgency_str}")
-                                print(f"    Queue position: ~{queue_pos}")
-
-                                order_id = await self.client.place_order(
-                                    token_id=decision.token_id,
-                                    side=decision.side,
-                                    size=decision.size,
-                                    price=decision.limit_price,
-                                )
-
-                                if order_id:
-                                    trade_id = order_id
-
-                                    self.order_tracker.add_order(
-                                        order_id=order_id,
-                                        token_id=decision.token_id,
-                                        price=decision.limit_price,
-                                        size=decision.size,
-                                        params=decision.order_params,
-                                    )
-
-                                    self.positions.add_position(
-                                        token_id=decision.token_id,
-                                        market_question=sig.market.question,
-                                        entry_price=decision.limit_price,
-                                        size=decision.size,
-                                        order_id=order_id,
-                                    )
-
-                                    self.metrics.record_trade_entry(
-                                        trade_id=order_id,
-                                        market_id=sig.market.condition_id,
-                                        market_question=sig.market.question,
-                                        signal_spike_pct=sig.spike_pct,
-                                        entry_price=decision.limit_price,
-                                        entry_size=decision.size,
-                                        order_urgency=urgency_str,
-                                        queue_position=queue_pos,
-                                    )
-                                else:
-                                    outcome = SignalOutcome.MISSED
-                        elif decision:
-                            # Decision made but size is 0
-                            if "too low" in decision.reason:
-                                outcome = SignalOutcome.SKIPPED_PRICE_BOUNDS
-                            elif "too high" in decision.reason:
-                                outcome = SignalOutcome.SKIPPED_PRICE_BOUNDS
-                            else:
-                                outcome = SignalOutcome.SKIPPED_LOW_CONFIDENCE
-                            print(f"  Skip: {decision.reason}")
-                        else:
-                            outcome = SignalOutcome.SKIPPED_LOW_CONFIDENCE
-
-                        # Record the signal
-                        self.metrics.record_signal(
+                        self.metrics.record_trade_entry(
+                            trade_id=order_id,
                             market_id=sig.market.condition_id,
                             market_question=sig.market.question,
-                            yes_price_before=sig.yes_price_before,
-                            yes_price_after=sig.yes_price_after,
-                            spike_pct=sig.spike_pct,
-                            no_price=sig.no_price,
-                            confidence=sig.confidence,
-                            spread_bps=analysis.spread_bps,
-                            bid_depth=analysis.bid_depth_1pct,
-                            ask_depth=analysis.ask_depth_1pct,
-                            book_imbalance=analysis.imbalance,
-                            outcome=outcome,
-                            trade_id=trade_id,
+                            signal_spike_pct=sig.spike_pct,
+                            entry_price=decision.limit_price,
+                            entry_size=decision.size,
+                            order_urgency=urgency_str,
+                            queue_position=queue_pos,
                         )
+                    else:
+                        outcome = SignalOutcome.MISSED
+            elif decision:
+                # Decision made but size is 0
+                outcome = decision.skip_reason or SignalOutcome.SKIPPED_LOW_CONFIDENCE
+                log.info("Skip: %s", decision.reason)
+            else:
+                outcome = SignalOutcome.SKIPPED_LOW_CONFIDENCE
+
+            # Record the signal
+            self.metrics.record_signal(
+                market_id=sig.market.condition_id,
+                market_question=sig.market.question,
+                yes_price_before=sig.yes_price_before,
+                yes_price_after=sig.yes_price_after,
+                spike_pct=sig.spike_pct,
+                no_price=sig.no_price,
+                confidence=sig.confidence,
+                spread_bps=analysis.spread_bps,
+                bid_depth=analysis.bid_depth_1pct,
+                ask_depth=analysis.ask_depth_1pct,
+                book_imbalance=analysis.imbalance,
+                outcome=outcome,
+                trade_id=trade_id,
+            )
+
+            # Queue for follow-up checks
+            for minutes in self.signal_check_minutes:
+                heapq.heappush(self._pending_signal_checks, (
+                    sig.timestamp + minutes * 60,
+                    sig.market.condition_id,
+                    sig.market.token_id_yes,
+                    sig.timestamp,
+                    minutes,
+                ))
+            self._pending_checks_dirty = True
+
+    async def _refresh_markets(self):
+        """Fetch the active market list and subscribe to new markets."""
+        markets = await self.client.get_active_markets()
+
+        # Only brand new markets need a starting baseline - the rest are
+        # kept current from the price feed
+        new_markets = [m for m in markets if m.token_id_yes not in self._markets]
+        self._markets = {m.token_id_yes: m for m in markets}
+        await self.detector.update_baselines(new_markets)
+
+        # NO tokens too, so the books we trade against are kept live
+        await self.client.subscribe([
+            token_id
+            for m in markets if m.liquidity >= config.min_liquidity
+            for token_id in (m.token_id_yes, m.token_id_no)
+        ])
+        log.info("Monitoring %d markets", len(markets))
+
+    async def _initial_refresh(self, max_delay: float = 60.0) -> bool:
+        """Fetch the first market list, backing off between failures.
+
+        Returns False if shutdown was requested before it succeeded.
+        """
+        delay = 10.0
+        while not self._stop_event.is_set():
+            try:
+                await self._refresh_markets()
+                return True
+            except Exception as e:
+                log.error("Error fetching markets: %s, retrying in %.0fs", e, delay)
+            await self._wait_for_stop(delay)
+            delay = min(delay * 2, max_delay)
+        return False
+
+    async def _refresh_markets_periodically(self, interval: float):
+        """Keep the market list fresh - it changes slowly, so rarely."""
+        while not self._stop_event.is_set():
+            await self._wait_for_stop(interval)
+            if self._stop_event.is_set():
+                return
+            try:
+                await self._refresh_markets()
+            except Exception as e:
+                log.error("Error refreshing markets: %s", e)
+
+    async def _housekeeping_loop(self):
+        """Update baselines, signal outcomes and positions on a fixed interval."""
+        iteration = 0
+        last_analytics_print = time.time()
+
+        while not self._stop_event.is_set():
+            try:
+                iteration += 1
+                log.info(self._UPDATE_FMT, iteration)
+
+                # 1. Update baselines for markets whose price moved
+                dirty, self._dirty_tokens = self._dirty_tokens, set()
+                await self.detector.update_baselines(
+                    [self._markets[t] for t in dirty if t in self._markets]
+                )
 
-                        # Queue for follow-up checks
-                        self._pending_signal_checks.append({
-                            "market_id": sig.market.condition_id,
-                            "token_id": sig.market.token_id_yes,
-                            "timestamp": sig.timestamp,
-                            "checks_remaining": [5, 15, 60],  # minutes
-                        })
+                # 2. Update pending signal checks (see if spikes reverted),
+                # saving them at most once per pass
+                await self._check_signal_outcomes()
+                self._save_pending_checks()
 
-                # 6. Update and check existing positions
+                # 3. Update and check existing positions
                 await self.positions.update_positions()
                 exits = await self.positions.check_exits()
 
@@ -269,65 +409,95 @@ class MeanReversionBot:
                         )
                     self.positions.close_position(token_id)
 
-                # 7. Print status
-                self.positions.print_status()
-                self._print_order_status()
+                # 4. Print status
+                if log.isEnabledFor(logging.INFO):
+                    self.positions.print_status()
+                    self._print_order_status()
 
                 # Cleanup old tracked orders
                 self.order_tracker.cleanup_old_orders()
 
+                # Save market profile changes held back since the last write
+                self.metrics.flush_markets()
+
+                # Historical analytics load the trade history, so they
+                # wait until the bot is up and trading (first pass)
+                if iteration == 1:
+                    self._print_startup_analytics()
+                    last_analytics_print = time.time()
+
                 # Print analytics every 30 minutes
                 if time.time() - last_analytics_print > 1800:
                     self.metrics.print_analytics()
                     last_analytics_print = time.time()
 
-                # Wait before next scan
-                await asyncio.sleep(self.scan_interval)
+            except Exception as e:
+                log.exception("Error in housekeeping loop: %s", e)
+
+            await self._wait_for_stop(self.housekeeping_interval)
+
+    def _print_startup_analytics(self):
+        """Show historical analytics and parameter suggestions."""
+        self.metrics.print_analytics()
 
+        suggestions = self.metrics.get_parameter_suggestions()
+        if suggestions:
+            log.info("Parameter Suggestions (based on historical data):")
+            for param, info in suggestions.items():
+                log.info("  %s: %s", param, info.get("reason", ""))
+
+    async def _order_loop(self):
+        """Check open orders on a short timer, independent of the feed."""
+        while not self._stop_event.is_set():
+            try:
+                await self._manage_open_orders()
             except Exception as e:
-                print(f"Error in main loop: {e}")
-                import traceback
-                traceback.print_exc()
-                await asyncio.sleep(10)
+                log.exception("Error managing orders: %s", e)
+
+            await self._wait_for_stop(self.order_check_interval)
 
     async def _check_signal_outcomes(self):
         """Check what happened to past signals (did they revert?)."""
         now = time.time()
-        still_pending = []
+        heap = self._pending_signal_checks
 
-        for check in self._pending_signal_checks:
-            if not check["checks_remaining"]:
-                continue
+        due = []
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap))
 
-            # Get current YES price
-            try:
-                yes_price = await self.client.get_price(check["token_id"])
-            except Exception:
-                still_pending.append(check)
-                continue
+        if not due:
+            return
 
-            elapsed_minutes = (now - check["timestamp"]) / 60
-
-            # Check if we've passed any check thresholds
-            new_remaining = []
-            for check_min in check["checks_remaining"]:
-                if elapsed_minutes >= check_min:
-                    # Update the signal record
-                    self.metrics.update_signal_outcome(
-                        market_id=check["market_id"],
-                        signal_timestamp=check["timestamp"],
-                        yes_price_now=yes_price,
-                        minutes_elapsed=check_min,
-                    )
-                else:
-                    new_remaining.append(check_min)
+        # Get current YES prices concurrently, once per token
+        token_ids = list({check[2] for check in due})
+        prices = await asyncio.gather(
+            *(self.client.get_price(t) for t in token_ids),
+            return_exceptions=True,
+        )
+        price_by_token = dict(zip(token_ids, prices))
 
-            check["checks_remaining"] = new_remaining
+        for check in due:
+            _, market_id, token_id, signal_timestamp, minutes = check
+            yes_price = price_by_token[token_id]
 
-            if new_remaining:
-                still_pending.append(check)
+            if isinstance(yes_price, Exception):
+                heapq.heappush(heap, check)  # Retry next pass
+                continue
+
+            # Update the signal record
+            self.metrics.update_signal_outcome(
+                market_id=market_id,
+                signal_timestamp=signal_timestamp,
+                yes_price_now=yes_price,
+                minutes_elapsed=minutes,
+            )
+            self._pending_checks_dirty = True
 
-        self._pending_signal_checks = still_pending
+    def _save_pending_checks(self):
+        """Hand the follow-up checks to the metrics writer if they changed."""
+        if self._pending_checks_dirty:
+            self.metrics.save_pending_checks(self._pending_signal_checks)
+            self._pending_checks_dirty = False
 
     async def _manage_open_orders(self):
         """Check open orders and cancel stale ones."""
@@ -337,34 +507,46 @@ class MeanReversionBot:
         open_orders = self.order_tracker.get_open_orders()
 
         for order in open_orders:
-            order_id = order["order_id"]
-            token_id = order["token_id"]
-            order_price = order["price"]
-            order_age = self.order_tracker.get_order_age(order_id)
-
-            # Get current orderbook
-            orderbook = await self.client.get_orderbook(token_id)
-            analysis = self.orderbook_analyzer.analyze(orderbook)
-
-            # Get original spike info if available
-            original_spike = 0.20  # Default assumption
-            if order.get("params"):
-                # Could store this, for now use default
-                pass
+            # One bad order mustn't stop the sweep for the rest
+            try:
+                await self._manage_order(order)
+            except Exception as e:
+                log.exception("Error managing order %.8s...: %s", order.order_id, e)
 
-            # Check if we should cancel
-            should_cancel, reason = self.orderbook_analyzer.should_cancel_order(
-                order_price=order_price,
-                order_age_seconds=order_age,
-                current_analysis=analysis,
-                original_spike_pct=original_spike,
-            )
+    async def _manage_order(self, order: OrderRecord):
+        """Cancel one open order if it has gone stale."""
+        order_id = order.order_id
+        token_id = order.token_id
+        order_price = order.price
+        order_age = self.order_tracker.get_order_age(order_id)
 
-            if should_cancel:
-                print(f"  Cancelling order {order_id[:8]}...: {reason}")
-                success = await self.client.cancel_order(order_id)
-                if success:
-                    self.order_tracker.cancel_order(order_id)
+        # Orderbook endpoint is failing for this token - check it later
+        if not self.client.orderbook_breaker.allow(token_id):
+            return
+
+        # Get current orderbook
+        orderbook = await self.client.get_orderbook(token_id)
+        analysis = self.orderbook_analyzer.analyze(orderbook)
+
+        # Get original spike info if available
+        original_spike = 0.20  # Default assumption
+        if order.params:
+            # Could store this, for now use default
+            pass
+
+        # Check if we should cancel
+        should_cancel, reason = self.orderbook_analyzer.should_cancel_order(
+            order_price=order_price,
+            order_age_seconds=order_age,
+            current_analysis=analysis,
+            original_spike_pct=original_spike,
+        )
+
+        if should_cancel:
+            log.info("Cancelling order %.8s...: %s", order_id, reason)
+            success = await self.client.cancel_order(order_id, token_id)
+            if success:
+                self.order_tracker.cancel_order(order_id)
 
     def _print_order_status(self):
         """Print status of open orders."""
@@ -373,21 +555,46 @@ class MeanReversionBot:
         if not open_orders:
             return
 
-        print(f"\nOpen Orders ({len(open_orders)}):")
+        log.info("Open Orders (%d):", len(open_orders))
         for order in open_orders:
-            age = self.order_tracker.get_order_age(order["order_id"])
-            print(
-                f"  {order['order_id'][:8]}... | "
-                f"${order['size']:.2f} @ {order['price']:.2f} | "
-                f"Age: {age:.0f}s"
-            )
+            age = self.order_tracker.get_order_age(order.order_id)
+            log.info(self._ORDER_STATUS_FMT, order.order_id, order.size, order.price, age)
+
+
+def setup_logging() -> QueueListener:
+    """Route log records through a queue so formatting and stdout writes
+    happen on a background thread instead of the event loop."""
+    log_queue: queue.Queue = queue.Queue(-1)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%H:%M:%S"))
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def run_event_loop(coro):
+    """Run coro on uvloop's faster event loop where it's available."""
+    try:
+        import uvloop
+    except ImportError:
+        # e.g. on Windows - keep the default asyncio loop
+        asyncio.run(coro)
+        return
+
+    uvloop.run(coro)
 
 
 async def main():
     """Entry point."""
     if not config.validate():
-        print("ERROR: Missing API credentials!")
-        print("Copy .env.example to .env and fill in your credentials.")
+        log.error("ERROR: Missing API credentials!")
+        log.error("Copy .env.example to .env and fill in your credentials.")
         sys.exit(1)
 
     bot = MeanReversionBot()
@@ -395,4 +602,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    listener = setup_logging()
+    try:
+        run_event_loop(main())
+    finally:
+        listener.stop()
@@ -6,27 +6,27 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingConfig:
     """Configuration for the mean reversion bot."""
 
     # Polymarket API credentials
-    private_key: str = os.getenv("PRIVATE_KEY", "")
-    api_key: str = os.getenv("API_KEY", "")
-    api_secret: str = os.getenv("API_SECRET", "")
-    api_passphrase: str = os.getenv("API_PASSPHRASE", "")
-    chain_id: int = int(os.getenv("CHAIN_ID", "137"))
+    private_key: str = ""
+    api_key: str = ""
+    api_secret: str = ""
+    api_passphrase: str = ""
+    chain_id: int = 137
 
     # Dry run mode - no actual trades placed
-    dry_run: bool = "--dry-run" in sys.argv or os.getenv("DRY_RUN", "false").lower() == "true"
+    dry_run: bool = False
 
     # Strategy parameters
-    min_spike_threshold: float = float(os.getenv("MIN_SPIKE_THRESHOLD", "0.20"))
+    min_spike_threshold: float = 0.20
     lookback_seconds: int = 300  # 5 minutes to detect spike
 
     # Position sizing
-    max_position_size: float = float(os.getenv("MAX_POSITION_SIZE", "100"))
-    min_liquidity: float = float(os.getenv("MIN_LIQUIDITY", "1000"))
+    max_position_size: float = 100.0
+    min_liquidity: float = 1000.0
 
     # Risk management
     max_open_positions: int = 5
@@ -37,6 +37,25 @@ class TradingConfig:
     clob_host: str = "https://clob.polymarket.com"
     gamma_host: str = "https://gamma-api.polymarket.com"
 
+    # Market data WebSocket feed
+    ws_host: str = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+    ws_heartbeat_seconds: int = 60
+
+    @classmethod
+    def from_env(cls) -> "TradingConfig":
+        """Build the config from environment variables and CLI flags."""
+        return cls(
+            private_key=os.getenv("PRIVATE_KEY", ""),
+            api_key=os.getenv("API_KEY", ""),
+            api_secret=os.getenv("API_SECRET", ""),
+            api_passphrase=os.getenv("API_PASSPHRASE", ""),
+            chain_id=int(os.getenv("CHAIN_ID", "137")),
+            dry_run="--dry-run" in sys.argv or os.getenv("DRY_RUN", "false").lower() == "true",
+            min_spike_threshold=float(os.getenv("MIN_SPIKE_THRESHOLD", "0.20")),
+            max_position_size=float(os.getenv("MAX_POSITION_SIZE", "100")),
+            min_liquidity=float(os.getenv("MIN_LIQUIDITY", "1000")),
+        )
+
     def validate(self) -> bool:
         """Check if required credentials are set."""
         return all([
@@ -47,4 +66,4 @@ class TradingConfig:
         ])
 
 
-config = TradingConfig()
+config = TradingConfig.from_env()
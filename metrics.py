@@ -1,13 +1,44 @@
 """Metrics collection and analytics for improving trade decisions."""
 
+import atexit
+import functools
 import json
+import logging
+import operator
+import os
+import queue
+import re
+import sys
+import threading
 import time
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from enum import Enum
 
+import numpy as np
+import orjson
+import pandas as pd
+
+log = logging.getLogger("metrics")
+
+# Analytics only look back this far, so older history isn't loaded
+HISTORY_WINDOW_SECONDS = 30 * 24 * 3600
+
+# Market categories by keyword, checked in order - first match wins
+CATEGORY_KEYWORDS = {
+    "politics": ["trump", "biden", "election", "president", "congress", "vote"],
+    "crypto": ["bitcoin", "ethereum", "btc", "eth", "crypto", "price"],
+    "sports": ["nfl", "nba", "mlb", "game", "win", "championship", "super bowl"],
+    "entertainment": ["movie", "oscar", "grammy", "album", "celebrity"],
+    "economics": ["fed", "rate", "inflation", "gdp", "economy"],
+}
+_CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE))
+    for category, words in CATEGORY_KEYWORDS.items()
+]
+
 
 class SignalOutcome(Enum):
     """What happened after we saw a signal."""
@@ -28,7 +59,29 @@ class TradeOutcome(Enum):
     CANCELLED = "cancelled"     # Order never filled
 
 
-@dataclass
+# Enum values compared against stored records, looked up once
+_TRADED = SignalOutcome.TRADED.value
+_WIN = TradeOutcome.WIN.value
+_LOSS = TradeOutcome.LOSS.value
+_BREAKEVEN = TradeOutcome.BREAKEVEN.value
+_PENDING = TradeOutcome.PENDING.value
+
+
+# String fields repeated across many records - interned so each distinct
+# value is stored once
+_INTERNED_FIELDS = ("market_id", "market_question", "outcome", "order_urgency")
+
+
+def _intern_fields(data: dict) -> dict:
+    """Intern the repeated string fields of a loaded record."""
+    for key in _INTERNED_FIELDS:
+        value = data.get(key)
+        if isinstance(value, str):
+            data[key] = sys.intern(value)
+    return data
+
+
+@dataclass(slots=True)
 class SignalRecord:
     """Record of a detected signal."""
     timestamp: float
@@ -59,7 +112,7 @@ class SignalRecord:
     did_revert: Optional[bool] = None  # Did YES come back down?
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeRecord:
     """Record of an executed trade."""
     trade_id: str
@@ -93,7 +146,7 @@ class TradeRecord:
     hold_time_seconds: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketProfile:
     """Profile of a market for classification."""
     market_id: str
@@ -113,8 +166,13 @@ class MarketProfile:
     trades_taken: int = 0
     win_rate: float = 0.0
 
+    # Closed trade counts behind win_rate
+    wins: int = 0
+    losses: int = 0
+    closed: int = 0
+
 
-@dataclass
+@dataclass(slots=True)
 class MetricsCollector:
     """Collects and persists metrics for analysis."""
 
@@ -127,51 +185,302 @@ class MetricsCollector:
     session_start: float = field(default_factory=time.time)
     signals_this_session: int = 0
     trades_this_session: int = 0
+    dropped_records: int = 0  # Records lost because the write queue was full
+
+    # Pending disk writes: (filename, encoded json line), None stops the writer thread
+    _write_queue: queue.Queue = field(
+        default_factory=lambda: queue.Queue(maxsize=10_000), init=False, repr=False
+    )
+    _writer_thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+
+    # Append handles kept open for the session, flushed every flush_every
+    # records or flush_interval seconds
+    _writers: dict[str, BinaryIO] = field(default_factory=dict, init=False, repr=False)
+    _unflushed: int = field(default=0, init=False, repr=False)
+    _last_flush: float = field(default_factory=time.monotonic, init=False, repr=False)
+    flush_every: int = 256
+    flush_interval: float = 5.0
+
+    # Signal/trade history is loaded on first use (_ensure_loaded), and only
+    # up to each file's size at startup so this session's records aren't
+    # read back in. Until then signals/trades hold this session's records only.
+    _history_loaded: bool = field(default=False, init=False, repr=False)
+    _history_bytes: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    # Lookups for updating records in place
+    _trades_by_id: dict[str, TradeRecord] = field(default_factory=dict, init=False, repr=False)
+    _signals_by_market: dict[str, list[SignalRecord]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    # Cached DataFrames for analytics; names in _stale_frames had records
+    # modified in place and need a full rebuild
+    _frames: dict[str, pd.DataFrame] = field(default_factory=dict, init=False, repr=False)
+    _stale_frames: set[str] = field(default_factory=set, init=False, repr=False)
+
+    # market_id -> category lookup for analytics; a profile's category is
+    # fixed when it's created, so this only changes as markets are added
+    _market_categories: Optional[pd.Series] = field(default=None, init=False, repr=False)
+
+    # get_analytics() result, reused until records change or the 5s bucket rolls
+    _version: int = field(default=0, init=False, repr=False)
+    _analytics_key: Optional[tuple[int, int]] = field(default=None, init=False, repr=False)
+    _analytics: Optional[dict] = field(default=None, init=False, repr=False)
+
+    # markets.json is rewritten at most once per flush_markets interval
+    _markets_dirty: bool = field(default=False, init=False, repr=False)
+    _last_markets_flush: float = field(default=0.0, init=False, repr=False)
 
     def __post_init__(self):
         self.data_dir.mkdir(exist_ok=True)
-        self._load_historical()
-
-    def _load_historical(self):
-        """Load historical data from disk."""
-        signals_file = self.data_dir / "signals.jsonl"
-        trades_file = self.data_dir / "trades.jsonl"
+        self._load_markets()
+
+        for filename in ("signals.jsonl", "trades.jsonl"):
+            f = open(self.data_dir / filename, "ab", buffering=64 * 1024)
+            self._history_bytes[filename] = f.tell()
+            self._fadvise(f, "POSIX_FADV_SEQUENTIAL")
+            self._writers[filename] = f
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="metrics-writer", daemon=True
+        )
+        self._writer_thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        """Stop the writer thread once it has written everything queued."""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join()
+
+        self._close_writers()
+        self.flush_markets(min_interval=0)
+
+    def _writer_loop(self, max_batch: int = 256):
+        """Write queued records to disk in batches of up to max_batch."""
+        while True:
+            try:
+                item = self._write_queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Quiet period - make sure buffered records reach disk
+                self.flush(force=True)
+                continue
+
+            # Take whatever else is already queued, up to max_batch
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= max_batch:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            if item is None:
+                return
+
+    def _write_batch(self, batch: list[tuple[str, bytes]]):
+        """Append a batch of JSON lines, one write per file.
+
+        Items for files without an append handle are whole-file
+        snapshots - only the latest one per file gets written.
+        """
+        by_file: dict[str, list[bytes]] = {}
+        snapshots: dict[str, bytes] = {}
+        for filename, data in batch:
+            if filename in self._writers:
+                by_file.setdefault(filename, []).append(data)
+            else:
+                snapshots[filename] = data
+
+        for filename, lines in by_file.items():
+            self._writers[filename].write(b"".join(lines))
+
+        for filename, data in snapshots.items():
+            path = self.data_dir / filename
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+        self._unflushed += len(batch)
+        self.flush()
+
+    def flush(self, force: bool = False):
+        """Flush buffered records to disk if enough have built up (or force)."""
+        if not self._unflushed:
+            return
+        if (
+            not force
+            and self._unflushed < self.flush_every
+            and time.monotonic() - self._last_flush < self.flush_interval
+        ):
+            return
+
+        for f in self._writers.values():
+            f.flush()
+            # Nothing rereads these until the next startup - don't let
+            # them crowd out the page cache
+            self._fadvise(f, "POSIX_FADV_DONTNEED")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _fadvise(f: BinaryIO, advice: str):
+        """Give the kernel a caching hint for a whole file, where supported."""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+        except OSError:
+            pass  # Only a hint - some filesystems reject it
+
+    def _close_writers(self):
+        """Flush and close the append handles."""
+        for f in self._writers.values():
+            f.close()
+
+    def _enqueue_write(self, filename: str, record):
+        """Queue a record for the background writer, dropping it if the queue is full.
+
+        orjson serializes the dataclass directly, skipping asdict()'s deep copy.
+        """
+        try:
+            self._write_queue.put_nowait((filename, orjson.dumps(record) + b"\n"))
+        except queue.Full:
+            self.dropped_records += 1
+
+    def _load_markets(self):
+        """Load market profiles from disk."""
         markets_file = self.data_dir / "markets.json"
-
-        if signals_file.exists():
-            with open(signals_file) as f:
-                for line in f:
-                    data = json.loads(line)
-                    self.signals.append(SignalRecord(**data))
-
-        if trades_file.exists():
-            with open(trades_file) as f:
-                for line in f:
-                    data = json.loads(line)
-                    self.trades.append(TradeRecord(**data))
-
         if markets_file.exists():
             with open(markets_file) as f:
                 data = json.load(f)
                 for k, v in data.items():
-                    self.markets[k] = MarketProfile(**v)
+                    profile = MarketProfile(**v)
+                    if "closed" not in v:
+                        self._seed_win_counts(profile)
+                    self.markets[k] = profile
+
+    def _seed_win_counts(self, profile: MarketProfile):
+        """Give a profile saved before the win/loss counters matching ones.
+
+        Only its win_rate was stored, so count its trades as closed at that
+        rate - otherwise the first exit would overwrite the stored win rate
+        with 0% or 100%. Breakevens can't be told apart, so count as losses.
+        """
+        profile.closed = profile.trades_taken
+        profile.wins = round(profile.win_rate * profile.trades_taken)
+        profile.losses = profile.closed - profile.wins
+        self._markets_dirty = True
+
+    def _read_history(self, filename: str) -> list[dict]:
+        """Parse the records that were in a log file when it was opened."""
+        size = self._history_bytes.get(filename, 0)
+        if not size:
+            return []
+        with open(self.data_dir / filename, "rb") as f:
+            return [orjson.loads(line) for line in f.read(size).splitlines() if line]
+
+    def _ensure_loaded(self):
+        """Load signal/trade history the first time something needs it."""
+        if not self._history_loaded:
+            self._history_loaded = True
+            self._load_historical()
 
-        print(f"Loaded {len(self.signals)} signals, {len(self.trades)} trades, {len(self.markets)} markets")
+    def _load_historical(self):
+        """Load recent history from disk (older records are skipped)."""
+        cutoff = time.time() - HISTORY_WINDOW_SECONDS
+
+        # Parsed rows also seed the analytics DataFrames, so the first
+        # get_analytics() doesn't have to walk the records again
+        signal_rows = [
+            _intern_fields(data)
+            for data in self._read_history("signals.jsonl")
+            if data["timestamp"] >= cutoff
+        ]
+        # Keep old trades that are still open - they can still exit
+        trade_rows = [
+            _intern_fields(data)
+            for data in self._read_history("trades.jsonl")
+            if data["timestamp"] >= cutoff or data.get("outcome") == _PENDING
+        ]
+
+        # History goes ahead of anything recorded before it was loaded
+        recorded_signals, recorded_trades = len(self.signals), len(self.trades)
+        self.signals[:0] = [SignalRecord(**data) for data in signal_rows]
+        self.trades[:0] = [TradeRecord(**data) for data in trade_rows]
+
+        self._signals_by_market = {}
+        for record in self.signals:
+            self._signals_by_market.setdefault(record.market_id, []).append(record)
+        self._trades_by_id = {trade.trade_id: trade for trade in self.trades}
+
+        if recorded_signals or recorded_trades:
+            self._frames.clear()
+        else:
+            self._frames["signals"] = pd.DataFrame.from_records(
+                signal_rows, columns=[f.name for f in fields(SignalRecord)]
+            )
+            self._frames["trades"] = pd.DataFrame.from_records(
+                trade_rows, columns=[f.name for f in fields(TradeRecord)]
+            )
+        self._version += 1
+
+        log.info("Loaded %d signals, %d trades, %d markets", len(signal_rows), len(trade_rows), len(self.markets))
 
     def _save_signal(self, signal: SignalRecord):
-        """Append signal to disk."""
-        with open(self.data_dir / "signals.jsonl", "a") as f:
-            f.write(json.dumps(asdict(signal)) + "\n")
+        """Queue signal to be appended to disk."""
+        self._enqueue_write("signals.jsonl", signal)
 
     def _save_trade(self, trade: TradeRecord):
-        """Append trade to disk."""
-        with open(self.data_dir / "trades.jsonl", "a") as f:
-            f.write(json.dumps(asdict(trade)) + "\n")
+        """Queue trade to be appended to disk."""
+        self._enqueue_write("trades.jsonl", trade)
 
     def _save_markets(self):
         """Save market profiles."""
-        with open(self.data_dir / "markets.json", "w") as f:
+        path = self.data_dir / "markets.json"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
             json.dump({k: asdict(v) for k, v in self.markets.items()}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def flush_markets(self, min_interval: float = 1.0):
+        """Save market profiles if they changed, at most once per min_interval seconds."""
+        if not self._markets_dirty:
+            return
+        if time.monotonic() - self._last_markets_flush < min_interval:
+            return
+
+        self._save_markets()
+        self._markets_dirty = False
+        self._last_markets_flush = time.monotonic()
+
+    def load_pending_checks(self, max_overdue: float = 300) -> list[tuple]:
+        """Load signal follow-up checks saved by a previous run.
+
+        Checks that fell due more than max_overdue seconds ago are
+        dropped - a price taken now wouldn't be the 5/15/60 minute price.
+        """
+        path = self.data_dir / "pending_checks.json"
+        if not path.exists():
+            return []
+
+        with open(path) as f:
+            checks = [tuple(c) for c in json.load(f)]
+
+        cutoff = time.time() - max_overdue
+        return [c for c in checks if c[0] >= cutoff]
+
+    def save_pending_checks(self, checks: list[tuple]):
+        """Persist signal follow-up checks so they survive a restart.
+
+        Serialized here, written by the background writer.
+        """
+        try:
+            self._write_queue.put_nowait(("pending_checks.json", orjson.dumps(checks)))
+        except queue.Full:
+            pass  # The next save carries the full list anyway
 
     def record_signal(
         self,
@@ -192,8 +501,8 @@ class MetricsCollector:
         """Record a signal we detected."""
         record = SignalRecord(
             timestamp=time.time(),
-            market_id=market_id,
-            market_question=market_question,
+            market_id=sys.intern(market_id),
+            market_question=sys.intern(market_question),
             yes_price_before=yes_price_before,
             yes_price_after=yes_price_after,
             spike_pct=spike_pct,
@@ -208,7 +517,9 @@ class MetricsCollector:
         )
 
         self.signals.append(record)
+        self._signals_by_market.setdefault(market_id, []).append(record)
         self.signals_this_session += 1
+        self._version += 1
         self._save_signal(record)
 
         # Update market profile
@@ -231,17 +542,19 @@ class MetricsCollector:
         record = TradeRecord(
             trade_id=trade_id,
             timestamp=time.time(),
-            market_id=market_id,
-            market_question=market_question,
+            market_id=sys.intern(market_id),
+            market_question=sys.intern(market_question),
             signal_spike_pct=signal_spike_pct,
             entry_price=entry_price,
             entry_size=entry_size,
-            order_urgency=order_urgency,
+            order_urgency=sys.intern(order_urgency),
             queue_position=queue_position,
         )
 
         self.trades.append(record)
+        self._trades_by_id[trade_id] = record
         self.trades_this_session += 1
+        self._version += 1
         self._save_trade(record)
 
         # Update market profile
@@ -257,12 +570,16 @@ class MetricsCollector:
         partial_fill_pct: float = 1.0,
     ):
         """Record that a trade was filled."""
-        for trade in reversed(self.trades):
-            if trade.trade_id == trade_id:
-                trade.fill_price = fill_price
-                trade.fill_time_seconds = fill_time_seconds
-                trade.partial_fill_pct = partial_fill_pct
-                break
+        self._ensure_loaded()
+        trade = self._trades_by_id.get(trade_id)
+        if trade is None:
+            return
+
+        trade.fill_price = fill_price
+        trade.fill_time_seconds = fill_time_seconds
+        trade.partial_fill_pct = partial_fill_pct
+        self._stale_frames.add("trades")
+        self._version += 1
 
     def record_trade_exit(
         self,
@@ -271,30 +588,33 @@ class MetricsCollector:
         exit_reason: str,
     ):
         """Record a trade exit and calculate PnL."""
-        for trade in reversed(self.trades):
-            if trade.trade_id == trade_id:
-                trade.exit_timestamp = time.time()
-                trade.exit_price = exit_price
-                trade.exit_reason = exit_reason
-                trade.hold_time_seconds = trade.exit_timestamp - trade.timestamp
-
-                # Calculate PnL
-                if trade.fill_price and trade.fill_price > 0:
-                    trade.pnl_pct = (exit_price - trade.fill_price) / trade.fill_price
-                    trade.pnl_dollars = trade.pnl_pct * trade.entry_size
-
-                    # Determine outcome
-                    if trade.pnl_pct > 0.01:
-                        trade.outcome = TradeOutcome.WIN.value
-                    elif trade.pnl_pct < -0.01:
-                        trade.outcome = TradeOutcome.LOSS.value
-                    else:
-                        trade.outcome = TradeOutcome.BREAKEVEN.value
-
-                    # Update market win rate
-                    self._update_market_win_rate(trade.market_id, trade.outcome)
+        self._ensure_loaded()
+        trade = self._trades_by_id.get(trade_id)
+        if trade is None:
+            return
+
+        trade.exit_timestamp = time.time()
+        trade.exit_price = exit_price
+        trade.exit_reason = exit_reason
+        trade.hold_time_seconds = trade.exit_timestamp - trade.timestamp
+        self._stale_frames.add("trades")
+        self._version += 1
+
+        # Calculate PnL
+        if trade.fill_price and trade.fill_price > 0:
+            trade.pnl_pct = (exit_price - trade.fill_price) / trade.fill_price
+            trade.pnl_dollars = trade.pnl_pct * trade.entry_size
+
+            # Determine outcome
+            if trade.pnl_pct > 0.01:
+                trade.outcome = _WIN
+            elif trade.pnl_pct < -0.01:
+                trade.outcome = _LOSS
+            else:
+                trade.outcome = _BREAKEVEN
 
-                break
+            # Update market win rate
+            self._update_market_win_rate(trade.market_id, trade.outcome)
 
     def update_signal_outcome(
         self,
@@ -304,8 +624,10 @@ class MetricsCollector:
         minutes_elapsed: int,
     ):
         """Update signal with what actually happened later."""
-        for signal in reversed(self.signals):
-            if signal.market_id == market_id and abs(signal.timestamp - signal_timestamp) < 60:
+        self._ensure_loaded()
+        # Only this market's signals need checking, newest first
+        for signal in reversed(self._signals_by_market.get(market_id, [])):
+            if abs(signal.timestamp - signal_timestamp) < 60:
                 if minutes_elapsed <= 5:
                     signal.yes_price_5min_later = yes_price_now
                 elif minutes_elapsed <= 15:
@@ -318,6 +640,8 @@ class MetricsCollector:
                     # YES spiked up, reversion = price came back down
                     signal.did_revert = yes_price_now < signal.yes_price_after - 0.05
 
+                self._stale_frames.add("signals")
+                self._version += 1
                 break
 
     def _update_market_profile(
@@ -341,122 +665,170 @@ class MetricsCollector:
         if trade:
             profile.trades_taken += 1
 
-        self._save_markets()
+        self._markets_dirty = True
+        self.flush_markets()
 
     def _update_market_win_rate(self, market_id: str, outcome: str):
         """Update win rate for a market."""
         if market_id in self.markets:
             profile = self.markets[market_id]
 
-            # Calculate from all trades in this market
-            market_trades = [t for t in self.trades if t.market_id == market_id and t.outcome != "pending"]
-            if market_trades:
-                wins = sum(1 for t in market_trades if t.outcome == TradeOutcome.WIN.value)
-                profile.win_rate = wins / len(market_trades)
-
-            self._save_markets()
-
-    def _classify_market(self, question: str) -> str:
-        """Simple keyword-based market classification."""
-        q = question.lower()
-
-        if any(w in q for w in ["trump", "biden", "election", "president", "congress", "vote"]):
-            return "politics"
-        elif any(w in q for w in ["bitcoin", "ethereum", "btc", "eth", "crypto", "price"]):
-            return "crypto"
-        elif any(w in q for w in ["nfl", "nba", "mlb", "game", "win", "championship", "super bowl"]):
-            return "sports"
-        elif any(w in q for w in ["movie", "oscar", "grammy", "album", "celebrity"]):
-            return "entertainment"
-        elif any(w in q for w in ["fed", "rate", "inflation", "gdp", "economy"]):
-            return "economics"
-        else:
-            return "other"
+            profile.closed += 1
+            if outcome == _WIN:
+                profile.wins += 1
+            elif outcome == _LOSS:
+                profile.losses += 1
+            profile.win_rate = profile.wins / profile.closed
+
+            self._markets_dirty = True
+            self.flush_markets()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _classify_market(question: str) -> str:
+        """Simple keyword-based market classification (cached per question)."""
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(question):
+                return category
+        return "other"
+
+    def _frame(self, name: str, records: list, record_type: type) -> pd.DataFrame:
+        """DataFrame of records, appending rows added since the last call.
+
+        Rebuilt from scratch if records were modified in place (marked stale).
+        """
+        columns = [f.name for f in fields(record_type)]
+        row = operator.attrgetter(*columns)
+
+        df = self._frames.get(name)
+        if df is None or name in self._stale_frames:
+            df = pd.DataFrame.from_records([row(r) for r in records], columns=columns)
+            self._stale_frames.discard(name)
+        elif len(records) > len(df):
+            new_rows = pd.DataFrame.from_records(
+                [row(r) for r in records[len(df):]], columns=columns
+            )
+            df = pd.concat([df, new_rows], ignore_index=True)
+
+        self._frames[name] = df
+        return df
+
+    def _category_lookup(self) -> pd.Series:
+        """Market categories indexed by market_id."""
+        if self._market_categories is None or len(self._market_categories) != len(self.markets):
+            self._market_categories = pd.Series(
+                [m.category for m in self.markets.values()],
+                index=list(self.markets),
+                dtype=object,
+            )
+        return self._market_categories
 
     def get_analytics(self) -> dict:
-        """Calculate analytics from collected data."""
+        """Calculate analytics, reusing the last result if nothing has changed."""
+        self._ensure_loaded()
         now = time.time()
+        key = (self._version, int(now // 5))
+        if key != self._analytics_key:
+            self._analytics = self._compute_analytics(now)
+            self._analytics_key = key
+        return self._analytics
+
+    def _compute_analytics(self, now: float) -> dict:
+        """Calculate analytics from collected data."""
+        cutoff = now - HISTORY_WINDOW_SECONDS
 
         # Filter to recent trades (last 30 days)
-        recent_trades = [t for t in self.trades if now - t.timestamp < 30 * 24 * 3600]
-        closed_trades = [t for t in recent_trades if t.outcome != "pending"]
+        trades = self._frame("trades", self.trades, TradeRecord)
+        recent_trades = trades[trades.timestamp.to_numpy(dtype=np.float64) > cutoff]
+        closed_trades = recent_trades[recent_trades.outcome != _PENDING]
+
+        won = closed_trades.outcome == _WIN
+        lost = closed_trades.outcome == _LOSS
+        pnl = pd.to_numeric(closed_trades.pnl_dollars).fillna(0.0)
+
+        closed = pd.DataFrame({
+            "won": won,
+            "lost": lost,
+            "pnl": pnl,
+            "win_pnl": pnl.where(won, 0.0),
+            "loss_pnl": pnl.where(lost, 0.0),
+            "urgency": closed_trades.order_urgency,
+            "spike": pd.cut(
+                closed_trades.signal_spike_pct,
+                [-np.inf, 0.25, 0.35, np.inf],
+                right=False,
+                labels=["small", "medium", "large"],
+            ),
+            "category": closed_trades.market_id.map(self._category_lookup()),
+        })
+
+        # One pass over closed trades - every breakdown below rolls up
+        # this small table (unknown categories kept so totals include them)
+        groups = closed.groupby(
+            ["urgency", "spike", "category"], observed=True, dropna=False
+        ).agg(
+            count=("won", "size"),
+            wins=("won", "sum"),
+            losses=("lost", "sum"),
+            pnl=("pnl", "sum"),
+            win_pnl=("win_pnl", "sum"),
+            loss_pnl=("loss_pnl", "sum"),
+        )
+        totals = groups.sum()
 
         # Win rate
-        if closed_trades:
-            wins = sum(1 for t in closed_trades if t.outcome == TradeOutcome.WIN.value)
-            win_rate = wins / len(closed_trades)
-        else:
-            win_rate = 0.0
+        win_rate = float(totals["wins"] / totals["count"]) if totals["count"] else 0.0
 
         # PnL
-        total_pnl = sum(t.pnl_dollars or 0 for t in closed_trades)
-        avg_win = 0.0
-        avg_loss = 0.0
-
-        winning_trades = [t for t in closed_trades if t.outcome == TradeOutcome.WIN.value]
-        losing_trades = [t for t in closed_trades if t.outcome == TradeOutcome.LOSS.value]
-
-        if winning_trades:
-            avg_win = sum(t.pnl_dollars or 0 for t in winning_trades) / len(winning_trades)
-        if losing_trades:
-            avg_loss = sum(t.pnl_dollars or 0 for t in losing_trades) / len(losing_trades)
+        total_pnl = float(totals["pnl"])
+        avg_win = float(totals["win_pnl"] / totals["wins"]) if totals["wins"] else 0.0
+        avg_loss = float(totals["loss_pnl"] / totals["losses"]) if totals["losses"] else 0.0
 
         # Signal quality
-        recent_signals = [s for s in self.signals if now - s.timestamp < 30 * 24 * 3600]
-        signals_that_reverted = [s for s in recent_signals if s.did_revert is True]
-        reversion_rate = len(signals_that_reverted) / len(recent_signals) if recent_signals else 0.0
+        signals = self._frame("signals", self.signals, SignalRecord)
+        recent_signals = signals[signals.timestamp.to_numpy(dtype=np.float64) > cutoff]
+        reversion_rate = float(recent_signals.did_revert.eq(True).mean()) if len(recent_signals) else 0.0
 
         # Fill analysis
-        filled_trades = [t for t in recent_trades if t.fill_time_seconds is not None]
-        avg_fill_time = sum(t.fill_time_seconds for t in filled_trades) / len(filled_trades) if filled_trades else 0.0
+        fill_times = pd.to_numeric(recent_trades.fill_time_seconds).dropna()
+        avg_fill_time = float(fill_times.mean()) if len(fill_times) else 0.0
 
         # By urgency
+        urgency_stats = groups.groupby(level="urgency").sum()
         by_urgency = {}
         for urgency in ["passive", "moderate", "aggressive"]:
-            urgency_trades = [t for t in closed_trades if t.order_urgency == urgency]
-            if urgency_trades:
-                urgency_wins = sum(1 for t in urgency_trades if t.outcome == TradeOutcome.WIN.value)
+            if urgency in urgency_stats.index:
+                row = urgency_stats.loc[urgency]
                 by_urgency[urgency] = {
-                    "count": len(urgency_trades),
-                    "win_rate": urgency_wins / len(urgency_trades),
+                    "count": int(row["count"]),
+                    "win_rate": float(row["wins"] / row["count"]),
                 }
 
         # By spike size
-        by_spike = {"small": [], "medium": [], "large": []}
-        for t in closed_trades:
-            if t.signal_spike_pct < 0.25:
-                by_spike["small"].append(t)
-            elif t.signal_spike_pct < 0.35:
-                by_spike["medium"].append(t)
-            else:
-                by_spike["large"].append(t)
-
-        spike_analysis = {}
-        for size, trades in by_spike.items():
-            if trades:
-                wins = sum(1 for t in trades if t.outcome == TradeOutcome.WIN.value)
-                spike_analysis[size] = {
-                    "count": len(trades),
-                    "win_rate": wins / len(trades),
-                    "avg_pnl": sum(t.pnl_dollars or 0 for t in trades) / len(trades),
-                }
+        spike_stats = groups.groupby(level="spike", observed=True).sum()
+        spike_analysis = {
+            str(size): {
+                "count": int(row["count"]),
+                "win_rate": float(row["wins"] / row["count"]),
+                "avg_pnl": float(row["pnl"] / row["count"]),
+            }
+            for size, row in spike_stats.iterrows()
+        }
 
         # By category
-        by_category = {}
-        for category in set(m.category for m in self.markets.values()):
-            cat_markets = [m.market_id for m in self.markets.values() if m.category == category]
-            cat_trades = [t for t in closed_trades if t.market_id in cat_markets]
-            if cat_trades:
-                wins = sum(1 for t in cat_trades if t.outcome == TradeOutcome.WIN.value)
-                by_category[category] = {
-                    "count": len(cat_trades),
-                    "win_rate": wins / len(cat_trades),
-                }
+        category_stats = groups.groupby(level="category").sum()
+        by_category = {
+            category: {
+                "count": int(row["count"]),
+                "win_rate": float(row["wins"] / row["count"]),
+            }
+            for category, row in category_stats.iterrows()
+        }
 
         return {
             "period": "30d",
             "signals_total": len(recent_signals),
-            "signals_traded": sum(1 for s in recent_signals if s.outcome == SignalOutcome.TRADED.value),
+            "signals_traded": int((recent_signals.outcome == _TRADED).sum()),
             "reversion_rate": reversion_rate,
             "trades_total": len(recent_trades),
             "trades_closed": len(closed_trades),
@@ -471,43 +843,46 @@ class MetricsCollector:
         }
 
     def print_analytics(self):
-        """Print formatted analytics."""
+        """Log formatted analytics."""
         analytics = self.get_analytics()
 
-        print("\n" + "=" * 60)
-        print("ANALYTICS (Last 30 Days)")
-        print("=" * 60)
+        log.info("=" * 60)
+        log.info("ANALYTICS (Last 30 Days)")
+        log.info("=" * 60)
 
-        print(f"\nSignals:")
-        print(f"  Total detected: {analytics['signals_total']}")
-        print(f"  Traded: {analytics['signals_traded']}")
-        print(f"  Reversion rate: {analytics['reversion_rate']:.1%}")
+        log.info("Signals:")
+        log.info("  Total detected: %d", analytics['signals_total'])
+        log.info("  Traded: %d", analytics['signals_traded'])
+        log.info("  Reversion rate: %.1f%%", analytics['reversion_rate'] * 100)
 
-        print(f"\nTrades:")
-        print(f"  Total: {analytics['trades_total']}")
-        print(f"  Closed: {analytics['trades_closed']}")
-        print(f"  Win rate: {analytics['win_rate']:.1%}")
-        print(f"  Total PnL: ${analytics['total_pnl']:.2f}")
-        print(f"  Avg win: ${analytics['avg_win']:.2f}")
-        print(f"  Avg loss: ${analytics['avg_loss']:.2f}")
-        print(f"  Avg fill time: {analytics['avg_fill_time_seconds']:.1f}s")
+        log.info("Trades:")
+        log.info("  Total: %d", analytics['trades_total'])
+        log.info("  Closed: %d", analytics['trades_closed'])
+        log.info("  Win rate: %.1f%%", analytics['win_rate'] * 100)
+        log.info("  Total PnL: $%.2f", analytics['total_pnl'])
+        log.info("  Avg win: $%.2f", analytics['avg_win'])
+        log.info("  Avg loss: $%.2f", analytics['avg_loss'])
+        log.info("  Avg fill time: %.1fs", analytics['avg_fill_time_seconds'])
 
         if analytics['by_urgency']:
-            print(f"\nBy Urgency:")
+            log.info("By Urgency:")
             for urgency, stats in analytics['by_urgency'].items():
-                print(f"  {urgency}: {stats['count']} trades, {stats['win_rate']:.1%} win rate")
+                log.info("  %s: %d trades, %.1f%% win rate", urgency, stats['count'], stats['win_rate'] * 100)
 
         if analytics['by_spike_size']:
-            print(f"\nBy Spike Size:")
+            log.info("By Spike Size:")
             for size, stats in analytics['by_spike_size'].items():
-                print(f"  {size} (n={stats['count']}): {stats['win_rate']:.1%} win rate, ${stats['avg_pnl']:.2f} avg")
+                log.info(
+                    "  %s (n=%d): %.1f%% win rate, $%.2f avg",
+                    size, stats['count'], stats['win_rate'] * 100, stats['avg_pnl'],
+                )
 
         if analytics['by_category']:
-            print(f"\nBy Category:")
+            log.info("By Category:")
             for cat, stats in analytics['by_category'].items():
-                print(f"  {cat}: {stats['count']} trades, {stats['win_rate']:.1%} win rate")
+                log.info("  %s: %d trades, %.1f%% win rate", cat, stats['count'], stats['win_rate'] * 100)
 
-        print("=" * 60 + "\n")
+        log.info("=" * 60)
 
     def get_parameter_suggestions(self) -> dict:
         """Suggest parameter adjustments based on data."""
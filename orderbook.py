@@ -1,9 +1,16 @@
 """Orderbook analysis and smart order placement."""
 
+import heapq
+import operator
+import time
 from dataclasses import dataclass
-from typing import Optional
+from itertools import islice
+from typing import Callable, Optional
 from enum import Enum
 
+import numpy as np
+from sortedcontainers import SortedDict
+
 
 class OrderUrgency(Enum):
     """How aggressively to place the order."""
@@ -12,40 +19,103 @@ class OrderUrgency(Enum):
     AGGRESSIVE = "aggressive"  # Cross spread, take liquidity
 
 
-@dataclass
-class OrderbookLevel:
-    """Single price level in the orderbook."""
-    price: float
-    size: float
-
-
-@dataclass
+# eq=False: the generated __eq__/__hash__ would compare the level
+# arrays, which raises - analyses compare and hash by identity
+@dataclass(slots=True, frozen=True, eq=False)
 class OrderbookAnalysis:
     """Analysis of orderbook state."""
     best_bid: float
     best_ask: float
+    mid_price: float
     spread: float
     spread_bps: float  # Spread in basis points
 
     bid_depth_1pct: float   # Liquidity within 1% of best bid
     ask_depth_1pct: float   # Liquidity within 1% of best ask
 
-    bid_levels: list[OrderbookLevel]
-    ask_levels: list[OrderbookLevel]
+    # Book levels as parallel arrays, best price first
+    bid_prices: np.ndarray
+    bid_sizes: np.ndarray
+    ask_prices: np.ndarray
+    ask_sizes: np.ndarray
 
     imbalance: float  # Positive = more bids, negative = more asks
 
-    @property
-    def mid_price(self) -> float:
-        return (self.best_bid + self.best_ask) / 2
+    is_thin: bool  # Spread > 5% or depth < $500
+
+
+def _aggressive_price(analysis: OrderbookAnalysis, tick: float) -> tuple[float, str]:
+    # Cross the spread - pay up to get filled immediately
+    # But don't pay more than mid
+    price = min(analysis.best_ask, analysis.mid_price + tick)
+    return round(price, 2), "Crossing spread for immediate fill"
+
+
+def _moderate_price(analysis: OrderbookAnalysis, tick: float) -> tuple[float, str]:
+    # Improve the bid by one tick, but don't exceed mid price
+    price = min(analysis.best_bid + tick, analysis.mid_price)
+    return round(price, 2), "Improving bid by 1 tick"
+
+
+def _passive_price(analysis: OrderbookAnalysis, tick: float) -> tuple[float, str]:
+    # Join the best bid
+    return analysis.best_bid, "Joining best bid"
+
+
+# Order price and reason for each urgency, given the book and tick size
+PRICE_FN: dict[OrderUrgency, Callable[[OrderbookAnalysis, float], tuple[float, str]]] = {
+    OrderUrgency.AGGRESSIVE: _aggressive_price,
+    OrderUrgency.MODERATE: _moderate_price,
+    OrderUrgency.PASSIVE: _passive_price,
+}
+
+
+class IncrementalOrderbook:
+    """Live orderbook for one token, kept current level by level.
+
+    Each side maps price -> size and stays sorted best price first, so an
+    update touches a single level and the top of book is always index 0.
+    """
+
+    def __init__(self):
+        self.bids = SortedDict(operator.neg)  # Highest first
+        self.asks = SortedDict()  # Lowest first
+
+    def _side(self, side: str) -> SortedDict:
+        return self.bids if side == "bids" else self.asks
+
+    def on_snapshot(self, bids: list[dict], asks: list[dict]):
+        """Replace the whole book (levels as {"price", "size"} dicts)."""
+        self.bids = SortedDict(operator.neg, {float(b["price"]): float(b["size"]) for b in bids})
+        self.asks = SortedDict({float(a["price"]): float(a["size"]) for a in asks})
+
+    def on_add(self, side: str, price: float, size: float):
+        """A new price level appeared."""
+        self._side(side)[price] = size
 
-    @property
-    def is_thin(self) -> bool:
-        """Book is thin if spread > 5% or depth < $500."""
-        return self.spread_bps > 500 or self.bid_depth_1pct < 500
+    def on_modify(self, side: str, price: float, size: float):
+        """The size resting at a price level changed."""
+        self._side(side)[price] = size
 
+    def on_cancel(self, side: str, price: float):
+        """A price level emptied."""
+        self._side(side).pop(price, None)
 
-@dataclass
+    def best_bid(self) -> Optional[float]:
+        return self.bids.peekitem(0)[0] if self.bids else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.peekitem(0)[0] if self.asks else None
+
+    def to_dict(self, depth: Optional[int] = None) -> dict:
+        """Book in the same format as a fetched orderbook, best price first."""
+        return {
+            "bids": [{"price": p, "size": s} for p, s in islice(self.bids.items(), depth)],
+            "asks": [{"price": p, "size": s} for p, s in islice(self.asks.items(), depth)],
+        }
+
+
+@dataclass(slots=True)
 class SmartOrderParams:
     """Parameters for a smart order."""
     price: float
@@ -68,93 +138,91 @@ class OrderbookAnalyzer:
         # Thresholds
         self.thin_spread_threshold = 0.05  # 5%
         self.wide_spread_threshold = 0.10  # 10%
+        self.thin_depth_threshold = 500  # $ within 1% of best bid
+        self.aggressive_spike = 0.40
+        self.moderate_spike = 0.30
 
     def analyze(self, orderbook: dict) -> OrderbookAnalysis:
         """Analyze an orderbook and return metrics."""
-        bids = orderbook.get("bids", [])
-        asks = orderbook.get("asks", [])
-
-        # Parse levels
-        bid_levels = [
-            OrderbookLevel(float(b["price"]), float(b["size"]))
-            for b in bids
-        ]
-        ask_levels = [
-            OrderbookLevel(float(a["price"]), float(a["size"]))
-            for a in asks
-        ]
+        bid_prices, bid_sizes = self._parse_levels(orderbook.get("bids", []))
+        ask_prices, ask_sizes = self._parse_levels(orderbook.get("asks", []))
 
         # Best prices
-        best_bid = bid_levels[0].price if bid_levels else 0.0
-        best_ask = ask_levels[0].price if ask_levels else 1.0
+        best_bid = float(bid_prices[0]) if len(bid_prices) else 0.0
+        best_ask = float(ask_prices[0]) if len(ask_prices) else 1.0
 
         spread = best_ask - best_bid
         spread_bps = (spread / best_bid * 10000) if best_bid > 0 else 0
 
         # Calculate depth within 1%
-        bid_depth = self._calc_depth(bid_levels, best_bid, direction=-1)
-        ask_depth = self._calc_depth(ask_levels, best_ask, direction=1)
+        bid_depth = self._calc_depth(bid_prices, bid_sizes, best_bid, direction=-1)
+        ask_depth = self._calc_depth(ask_prices, ask_sizes, best_ask, direction=1)
 
         # Order imbalance
-        total_bid = sum(l.size for l in bid_levels[:5])
-        total_ask = sum(l.size for l in ask_levels[:5])
+        total_bid = float(bid_sizes[:5].sum())
+        total_ask = float(ask_sizes[:5].sum())
         imbalance = (total_bid - total_ask) / (total_bid + total_ask) if (total_bid + total_ask) > 0 else 0
 
         return OrderbookAnalysis(
             best_bid=best_bid,
             best_ask=best_ask,
+            mid_price=(best_bid + best_ask) * 0.5,
             spread=spread,
             spread_bps=spread_bps,
             bid_depth_1pct=bid_depth,
             ask_depth_1pct=ask_depth,
-            bid_levels=bid_levels,
-            ask_levels=ask_levels,
+            bid_prices=bid_prices,
+            bid_sizes=bid_sizes,
+            ask_prices=ask_prices,
+            ask_sizes=ask_sizes,
             imbalance=imbalance,
+            is_thin=(
+                spread_bps > self.thin_spread_threshold * 10000
+                or bid_depth < self.thin_depth_threshold
+            ),
         )
 
+    def _parse_levels(self, levels: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+        """Split book levels into (prices, sizes) arrays."""
+        arr = np.array(
+            [(level["price"], level["size"]) for level in levels], dtype=np.float64
+        ).reshape(-1, 2)
+        return arr[:, 0], arr[:, 1]
+
     def _calc_depth(
         self,
-        levels: list[OrderbookLevel],
+        prices: np.ndarray,
+        sizes: np.ndarray,
         reference: float,
         direction: int,  # -1 for bids, +1 for asks
     ) -> float:
         """Calculate total size within 1% of reference price."""
-        if not levels or reference <= 0:
+        if not len(prices) or reference <= 0:
             return 0.0
 
         threshold = reference * (1 + direction * 0.01)
-        total = 0.0
-
-        for level in levels:
-            if direction == -1 and level.price >= threshold:
-                total += level.size
-            elif direction == 1 and level.price <= threshold:
-                total += level.size
-
-        return total
+        if direction == -1:
+            return float(sizes[prices >= threshold].sum())
+        return float(sizes[prices <= threshold].sum())
 
     def calculate_queue_position(
         self,
         price: float,
         size: float,
-        bid_levels: list[OrderbookLevel],
+        bid_prices: np.ndarray,
+        bid_sizes: np.ndarray,
     ) -> int:
         """Estimate queue position if we place at this price."""
-        position = 0
-
-        for level in bid_levels:
-            if level.price > price:
-                # Orders ahead of us
-                position += int(level.size)
-            elif level.price == price:
-                # Same price level - we're at the back
-                position += int(level.size)
-                break
-            else:
-                # Our price is better
-                break
-
-        return position
+        # Orders ahead of us are the levels before the first one at or
+        # below our price
+        at_or_below = bid_prices <= price
+        first = int(at_or_below.argmax()) if at_or_below.any() else len(bid_prices)
+
+        # Same price level - we're at the back
+        if first < len(bid_prices) and bid_prices[first] == price:
+            first += 1
+
+        return int(np.trunc(bid_sizes[:first]).sum())
 
     def get_optimal_order(
         self,
@@ -185,7 +253,8 @@ class OrderbookAnalyzer:
         queue_pos = self.calculate_queue_position(
             price,
             target_size,
-            analysis.bid_levels,
+            analysis.bid_prices,
+            analysis.bid_sizes,
         )
 
         # Rough fill time estimate (assumes $100/min volume at this level)
@@ -209,11 +278,11 @@ class OrderbookAnalyzer:
         """Determine how aggressively to place the order."""
 
         # Massive spike (>40%) - be aggressive, this is likely to revert fast
-        if spike_magnitude >= 0.40:
+        if spike_magnitude >= self.aggressive_spike:
             return OrderUrgency.AGGRESSIVE
 
         # Large spike (>30%) or thin book - moderate aggression
-        if spike_magnitude >= 0.30 or analysis.is_thin:
+        if spike_magnitude >= self.moderate_spike or analysis.is_thin:
             return OrderUrgency.MODERATE
 
         # If book is imbalanced toward asks (sellers), we can be passive
@@ -235,22 +304,7 @@ class OrderbookAnalyzer:
     ) -> tuple[float, str]:
         """Calculate order price based on urgency."""
 
-        if urgency == OrderUrgency.AGGRESSIVE:
-            # Cross the spread - pay up to get filled immediately
-            # But don't pay more than mid
-            price = min(analysis.best_ask, analysis.mid_price + self.tick_size)
-            return round(price, 2), "Crossing spread for immediate fill"
-
-        elif urgency == OrderUrgency.MODERATE:
-            # Improve the bid by one tick
-            price = analysis.best_bid + self.tick_size
-            # Don't exceed mid price
-            price = min(price, analysis.mid_price)
-            return round(price, 2), "Improving bid by 1 tick"
-
-        else:  # PASSIVE
-            # Join the best bid
-            return analysis.best_bid, "Joining best bid"
+        return PRICE_FN[urgency](analysis, self.tick_size)
 
     def should_cancel_order(
         self,
@@ -287,11 +341,28 @@ class OrderbookAnalyzer:
         return False, ""
 
 
+@dataclass(slots=True)
+class OrderRecord:
+    """An order we've placed and are tracking."""
+    order_id: str
+    token_id: str
+    price: float
+    size: float
+    original_size: float
+    params: Optional[SmartOrderParams]
+    submit_monotonic: float  # time.monotonic() at submission
+    filled: float = 0.0
+    status: str = "open"
+
+
 class OrderTracker:
     """Tracks open orders and their status."""
 
     def __init__(self):
-        self.orders: dict[str, dict] = {}  # order_id -> order info
+        self.orders: dict[str, OrderRecord] = {}  # order_id -> order
+        self._open: dict[str, OrderRecord] = {}  # open orders, in submission order
+        # (submit_monotonic, order_id) for filled/cancelled orders, oldest first
+        self._finished: list[tuple[float, str]] = []
 
     def add_order(
         self,
@@ -302,55 +373,55 @@ class OrderTracker:
         params: SmartOrderParams,
     ):
         """Track a new order."""
-        import time
-        self.orders[order_id] = {
-            "order_id": order_id,
-            "token_id": token_id,
-            "price": price,
-            "size": size,
-            "original_size": size,
-            "filled": 0.0,
-            "created_at": time.time(),
-            "params": params,
-            "status": "open",
-        }
+        order = OrderRecord(
+            order_id=order_id,
+            token_id=token_id,
+            price=price,
+            size=size,
+            original_size=size,
+            params=params,
+            submit_monotonic=time.monotonic(),
+        )
+        self.orders[order_id] = order
+        self._open[order_id] = order
+
+    def _finish(self, order: OrderRecord, status: str):
+        """Move an order out of the open set."""
+        order.status = status
+        if self._open.pop(order.order_id, None) is not None:
+            heapq.heappush(self._finished, (order.submit_monotonic, order.order_id))
 
     def update_fill(self, order_id: str, filled_size: float):
         """Update fill amount for an order."""
-        if order_id in self.orders:
-            self.orders[order_id]["filled"] = filled_size
-            self.orders[order_id]["size"] = (
-                self.orders[order_id]["original_size"] - filled_size
-            )
-            if self.orders[order_id]["size"] <= 0:
-                self.orders[order_id]["status"] = "filled"
+        order = self.orders.get(order_id)
+        if order:
+            order.filled = filled_size
+            order.size = order.original_size - filled_size
+            if order.size <= 0:
+                self._finish(order, "filled")
 
     def cancel_order(self, order_id: str):
         """Mark order as cancelled."""
-        if order_id in self.orders:
-            self.orders[order_id]["status"] = "cancelled"
+        order = self.orders.get(order_id)
+        if order:
+            self._finish(order, "cancelled")
 
-    def get_open_orders(self) -> list[dict]:
+    def get_open_orders(self) -> list[OrderRecord]:
         """Get all open orders."""
-        return [o for o in self.orders.values() if o["status"] == "open"]
+        return list(self._open.values())
 
     def get_order_age(self, order_id: str) -> float:
         """Get age of order in seconds."""
-        import time
-        if order_id in self.orders:
-            return time.time() - self.orders[order_id]["created_at"]
+        order = self.orders.get(order_id)
+        if order:
+            return time.monotonic() - order.submit_monotonic
         return 0.0
 
     def cleanup_old_orders(self, max_age_seconds: int = 3600):
         """Remove old completed/cancelled orders from tracking."""
-        import time
-        now = time.time()
-        to_remove = []
-
-        for order_id, order in self.orders.items():
-            if order["status"] in ("filled", "cancelled"):
-                if now - order["created_at"] > max_age_seconds:
-                    to_remove.append(order_id)
+        cutoff = time.monotonic() - max_age_seconds
 
-        for order_id in to_remove:
-            del self.orders[order_id]
+        # Oldest finished orders are at the top of the heap
+        while self._finished and self._finished[0][0] < cutoff:
+            _, order_id = heapq.heappop(self._finished)
+            self.orders.pop(order_id, None)
@@ -1,20 +1,35 @@
 """Polymarket API client for market data and trading."""
 
 import asyncio
-import json
+import logging
+import operator
+import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from dataclasses import dataclass
 import aiohttp
+import orjson
 
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import OrderArgs, OrderType
 from py_clob_client.order_builder.constants import BUY
 
 from config import config
+from orderbook import IncrementalOrderbook
 
+log = logging.getLogger("polymarket")
 
-@dataclass
+# What a failed or hung feed connection can raise (a handshake timeout
+# is not a ClientError)
+_WS_ERRORS = (aiohttp.ClientError, OSError, asyncio.TimeoutError)
+
+# Fields a Gamma market must have to be usable (the rest are optional)
+_REQUIRED_MARKET_FIELDS = operator.itemgetter("conditionId", "clobTokenIds")
+
+
+@dataclass(slots=True)
 class Market:
     """Represents a Polymarket market."""
 
@@ -29,7 +44,7 @@ class Market:
     end_date: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceSnapshot:
     """Price snapshot at a point in time."""
 
@@ -38,13 +53,79 @@ class PriceSnapshot:
     timestamp: float
 
 
+class CircuitBreaker:
+    """Stops calling a failing endpoint for a while after repeated errors.
+
+    Failures are counted per key (e.g. token_id), so one bad token
+    doesn't block requests for the others.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 30):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+
+    def allow(self, key: str = "") -> bool:
+        """Whether a call for this key should go ahead."""
+        open_until = self._open_until.get(key)
+        if open_until is None:
+            return True
+        if time.monotonic() >= open_until:
+            # Cooldown over - let the next call through to test the endpoint
+            del self._open_until[key]
+            return True
+        return False
+
+    def record_success(self, key: str = ""):
+        """Reset the failure count after a successful call."""
+        self._failures.pop(key, None)
+
+    def record_failure(self, key: str = ""):
+        """Count a failure, tripping the breaker once threshold is hit."""
+        failures = self._failures.get(key, 0) + 1
+        if failures >= self.threshold:
+            self._open_until[key] = time.monotonic() + self.cooldown
+            self._failures.pop(key, None)
+            log.warning("%s failing for %s, pausing %.0fs", self.name, key or "all", self.cooldown)
+        else:
+            self._failures[key] = failures
+
+
 class PolymarketClient:
     """Client for interacting with Polymarket."""
 
     def __init__(self):
         self.clob_client: Optional[ClobClient] = None
         self.session: Optional[aiohttp.ClientSession] = None
-        self._price_history: dict[str, list[PriceSnapshot]] = {}
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._price_history: dict[str, deque[PriceSnapshot]] = {}
+
+        # Recently fetched orderbooks: token_id -> (fetched_at, book)
+        self._orderbook_cache: dict[str, tuple[float, dict]] = {}
+        self._orderbook_ttl = 1.0  # seconds
+        # The CLOB client is blocking, so its calls run on this pool -
+        # sized to cap how many requests we have in flight at once
+        self._clob_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="clob")
+
+        # In-flight fetches, so concurrent callers share one request
+        self._orderbook_pending: dict[str, asyncio.Future] = {}
+
+        # Live orderbooks maintained from the market feed, for subscribed
+        # tokens once their first snapshot has arrived
+        self._books: dict[str, IncrementalOrderbook] = {}
+
+        # Live price updates from the market feed (None signals shutdown)
+        self.price_events: asyncio.Queue[Optional[PriceSnapshot]] = asyncio.Queue()
+        self._subscribed: set[str] = set()
+        # Reader and heartbeat tasks - the bot watches these for exits
+        self.feed_tasks: list[asyncio.Task] = []
+
+        # Back off from endpoints that keep failing
+        self.markets_breaker = CircuitBreaker("Market list")
+        self.orderbook_breaker = CircuitBreaker("Orderbook")
+        self.order_breaker = CircuitBreaker("Order placement")
 
     async def connect(self):
         """Initialize connections."""
@@ -62,13 +143,176 @@ class PolymarketClient:
             },
         )
 
-        self.session = aiohttp.ClientSession()
-        print("Connected to Polymarket")
+        # Pooled keep-alive connections so repeat requests skip the
+        # TCP/TLS handshake (and cached DNS so new ones skip the lookup)
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=5),
+            read_bufsize=64 * 1024,
+        )
+        log.info("Connected to Polymarket")
+
+    async def start_feed(self):
+        """Open the market feed with everything subscribed so far."""
+        await self._open_ws()
+        self.feed_tasks = [
+            asyncio.create_task(self._ws_reader(), name="ws_reader"),
+            asyncio.create_task(self._ws_heartbeat(), name="ws_heartbeat"),
+        ]
 
     async def close(self):
         """Close connections."""
+        for task in self.feed_tasks:
+            task.cancel()
+        if self.ws:
+            await self.ws.close()
         if self.session:
             await self.session.close()
+        self._clob_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _call_clob(self, func, *args):
+        """Run a blocking CLOB client call without stalling the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._clob_pool, func, *args)
+
+    async def subscribe(self, asset_ids: list[str]):
+        """Subscribe the market feed to price updates for these tokens."""
+        new_ids = [a for a in asset_ids if a not in self._subscribed]
+        if not new_ids:
+            return
+
+        if self.ws is None:
+            # Feed not started yet - _open_ws subscribes to these
+            self._subscribed.update(new_ids)
+            return
+
+        if self._subscribed:
+            message = {"assets_ids": new_ids, "operation": "subscribe"}
+        else:
+            message = {"type": "market", "assets_ids": new_ids}
+
+        self._subscribed.update(new_ids)
+        await self.ws.send_str(orjson.dumps(message).decode())
+
+    async def _open_ws(self):
+        """Open the market feed and restore any existing subscriptions."""
+        self.ws = await self.session.ws_connect(config.ws_host)
+        if self._subscribed:
+            await self.ws.send_str(orjson.dumps(
+                {"type": "market", "assets_ids": list(self._subscribed)}
+            ).decode())
+
+    async def _ws_reader(self):
+        """Push price updates from the market feed onto price_events."""
+        while True:
+            async for msg in self.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+
+                try:
+                    payload = orjson.loads(msg.data)
+                except orjson.JSONDecodeError:
+                    continue  # PONG replies to our heartbeat
+
+                events = payload if isinstance(payload, list) else [payload]
+                for event in events:
+                    self._apply_book_event(event)
+                    snapshot = self._parse_trade_event(event)
+                    if snapshot is not None:
+                        self._orderbook_cache.pop(snapshot.token_id, None)
+                        self.price_events.put_nowait(snapshot)
+
+            # Feed dropped - reconnect unless we're shutting down
+            if self.session.closed:
+                return
+            log.warning("Market feed disconnected, reconnecting...")
+            # Updates missed while down would leave the books wrong - fall
+            # back to fetching until fresh snapshots arrive
+            self._books.clear()
+            await self._reconnect_ws()
+
+    async def _reconnect_ws(self, max_delay: float = 30.0):
+        """Reopen the market feed, backing off until it comes back."""
+        delay = 1.0
+        while not self.session.closed:
+            await asyncio.sleep(delay)
+            try:
+                await self._open_ws()
+                return
+            except _WS_ERRORS as e:
+                log.error("Error reconnecting market feed: %r, retrying in %.0fs", e, delay)
+                delay = min(delay * 2, max_delay)
+
+    async def _ws_heartbeat(self):
+        """Keep the market feed alive."""
+        while True:
+            await asyncio.sleep(config.ws_heartbeat_seconds)
+            if self.ws and not self.ws.closed:
+                try:
+                    await self.ws.send_str("PING")
+                except _WS_ERRORS as e:
+                    # Half-closed socket - the reader sees the drop and
+                    # reconnects
+                    log.warning("Market feed heartbeat failed: %r", e)
+
+    def _apply_book_event(self, event: dict):
+        """Update the live orderbooks from a market feed message.
+
+        Quote changes only ever update books - they never become price
+        updates, as one cancel on a thin book can swing the mid.
+        """
+        event_type = event.get("event_type")
+
+        try:
+            if event_type == "book":
+                book = IncrementalOrderbook()
+                book.on_snapshot(event.get("bids", []), event.get("asks", []))
+                self._books[sys.intern(event["asset_id"])] = book
+                self._orderbook_cache.pop(event["asset_id"], None)
+
+            elif event_type == "price_change":
+                for change in event.get("price_changes", []):
+                    # Any fetched copy of this book is now out of date
+                    self._orderbook_cache.pop(change["asset_id"], None)
+                    book = self._books.get(change["asset_id"])
+                    if book is None:
+                        continue  # No snapshot to apply it to yet
+
+                    side = "bids" if change["side"] == "BUY" else "asks"
+                    price = float(change["price"])
+                    size = float(change["size"])
+                    if size == 0:
+                        book.on_cancel(side, price)
+                    elif price in (book.bids if side == "bids" else book.asks):
+                        book.on_modify(side, price, size)
+                    else:
+                        book.on_add(side, price, size)
+        except (KeyError, ValueError, TypeError):
+            pass
+
+    def _parse_trade_event(self, event: dict) -> Optional[PriceSnapshot]:
+        """Extract the last trade price from a market feed message.
+
+        Spike detection works on last trade prices (like the Gamma API's),
+        so these are the only price updates the feed produces.
+        """
+        if event.get("event_type") != "last_trade_price":
+            return None
+
+        try:
+            return PriceSnapshot(
+                token_id=sys.intern(event["asset_id"]),
+                price=float(event["price"]),
+                timestamp=time.time(),
+            )
+        except (KeyError, ValueError, TypeError):
+            return None
 
     async def get_active_markets(self) -> list[Market]:
         """Fetch active markets from Gamma API."""
@@ -78,91 +322,143 @@ class PolymarketClient:
             "limit": 100,
         }
 
-        async with self.session.get(url, params=params) as resp:
-            if resp.status != 200:
-                raise Exception(f"Failed to fetch markets: {resp.status}")
+        if not self.markets_breaker.allow():
+            raise Exception("Market list fetch paused after repeated failures")
 
-            data = await resp.json()
-            markets = []
+        try:
+            async with self.session.get(url, params=params) as resp:
+                if resp.status != 200:
+                    raise Exception(f"Failed to fetch markets: {resp.status}")
+
+                data = orjson.loads(await resp.read())
+        except Exception:
+            self.markets_breaker.record_failure()
+            raise
+
+        self.markets_breaker.record_success()
+        markets = []
+
+        for item in data:
+            try:
+                condition_id, token_ids = _REQUIRED_MARKET_FIELDS(item)
+
+                # Parse clobTokenIds - can be JSON string or list
+                if isinstance(token_ids, str):
+                    token_ids = orjson.loads(token_ids)
+                if not token_ids or len(token_ids) < 2:
+                    continue
 
-            for item in data:
-                try:
-                    # Parse clobTokenIds - can be JSON string or list
-                    token_ids = item.get("clobTokenIds")
-                    if isinstance(token_ids, str):
-                        token_ids = json.loads(token_ids)
-                    if not token_ids or len(token_ids) < 2:
-                        continue
-
-                    # Parse outcomePrices - can be JSON string or list
-                    prices = item.get("outcomePrices", "[0.5, 0.5]")
-                    if isinstance(prices, str):
-                        prices = json.loads(prices)
-
-                    markets.append(
-                        Market(
-                            condition_id=item["conditionId"],
-                            question=item.get("question", ""),
-                            token_id_yes=token_ids[0],
-                            token_id_no=token_ids[1],
-                            price_yes=float(prices[0]),
-                            price_no=float(prices[1]),
-                            volume_24h=float(item.get("volume24hr", 0)),
-                            liquidity=float(item.get("liquidity", 0)),
-                            end_date=item.get("endDate"),
-                        )
+                # Parse outcomePrices - can be JSON string or list
+                prices = item.get("outcomePrices") or [0.5, 0.5]
+                if isinstance(prices, str):
+                    prices = orjson.loads(prices)
+
+                markets.append(
+                    Market(
+                        condition_id=condition_id,
+                        question=item.get("question") or "",
+                        # Interned so hot token_id dict lookups can match
+                        # on identity
+                        token_id_yes=sys.intern(token_ids[0]),
+                        token_id_no=sys.intern(token_ids[1]),
+                        price_yes=float(prices[0]),
+                        price_no=float(prices[1]),
+                        # Gamma sends null for these on some new markets
+                        volume_24h=float(item.get("volume24hr") or 0),
+                        liquidity=float(item.get("liquidity") or 0),
+                        end_date=item.get("endDate"),
                     )
-                except (KeyError, IndexError, ValueError, json.JSONDecodeError) as e:
-                    continue
+                )
+            except (KeyError, IndexError, TypeError, ValueError, orjson.JSONDecodeError):
+                continue
 
-            return markets
+        return markets
 
     async def get_orderbook(self, token_id: str) -> dict:
-        """Get orderbook for a token."""
+        """Get orderbook for a token (cached briefly to avoid duplicate fetches)."""
+        live = self._books.get(token_id)
+        if live is not None:
+            return live.to_dict()
+
+        cached = self._orderbook_cache.get(token_id)
+        if cached and time.monotonic() - cached[0] < self._orderbook_ttl:
+            return cached[1]
+
+        pending = self._orderbook_pending.get(token_id)
+        if pending is None:
+            if not self.orderbook_breaker.allow(token_id):
+                return {"bids": [], "asks": []}
+
+            pending = asyncio.ensure_future(self._fetch_orderbook(token_id))
+            self._orderbook_pending[token_id] = pending
+            pending.add_done_callback(lambda _: self._orderbook_pending.pop(token_id, None))
+
+        # Shielded so one caller being cancelled doesn't cancel the
+        # fetch for everyone else waiting on it
+        return await asyncio.shield(pending)
+
+    async def _fetch_orderbook(self, token_id: str) -> dict:
+        """Fetch an orderbook from the CLOB and cache it."""
         try:
-            book = self.clob_client.get_order_book(token_id)
+            book = await self._call_clob(self.clob_client.get_order_book, token_id)
             # Convert OrderBookSummary object to dict with float prices
-            return {
+            orderbook = {
                 "bids": [{"price": float(b.price), "size": float(b.size)} for b in (book.bids or [])],
                 "asks": [{"price": float(a.price), "size": float(a.size)} for a in (book.asks or [])],
             }
+            self._orderbook_cache[token_id] = (time.monotonic(), orderbook)
+            self.orderbook_breaker.record_success(token_id)
+            return orderbook
         except Exception as e:
-            print(f"Error fetching orderbook: {e}")
+            log.error("Error fetching orderbook: %s", e)
+            self.orderbook_breaker.record_failure(token_id)
             return {"bids": [], "asks": []}
 
-    async def get_price(self, token_id: str) -> float:
-        """Get current mid price for a token."""
+    async def get_top_of_book(self, token_id: str) -> tuple[Optional[float], Optional[float]]:
+        """Best bid and ask for a token (None for an empty side).
+
+        Reads the live book when the feed has one, otherwise the shared
+        cached orderbook, so a price check followed by a full book
+        analysis costs one request.
+        """
+        live = self._books.get(token_id)
+        if live is not None:
+            return live.best_bid(), live.best_ask()
+
         book = await self.get_orderbook(token_id)
+        bids = book.get("bids")
+        asks = book.get("asks")
+        return (
+            bids[0]["price"] if bids else None,
+            asks[0]["price"] if asks else None,
+        )
 
-        bids = book.get("bids", [])
-        asks = book.get("asks", [])
+    async def get_price(self, token_id: str) -> float:
+        """Get current mid price for a token."""
+        best_bid, best_ask = await self.get_top_of_book(token_id)
 
-        if bids and asks:
-            best_bid = float(bids[0]["price"])
-            best_ask = float(asks[0]["price"])
+        if best_bid is not None and best_ask is not None:
             return (best_bid + best_ask) / 2
-        elif bids:
-            return float(bids[0]["price"])
-        elif asks:
-            return float(asks[0]["price"])
+        elif best_bid is not None:
+            return best_bid
+        elif best_ask is not None:
+            return best_ask
 
         return 0.5  # Default to 50%
 
     def record_price(self, token_id: str, price: float):
         """Record price for tracking spikes."""
-        now = time.time()
-        snapshot = PriceSnapshot(token_id=token_id, price=price, timestamp=now)
+        self.record_snapshot(PriceSnapshot(token_id=token_id, price=price, timestamp=time.time()))
 
-        if token_id not in self._price_history:
-            self._price_history[token_id] = []
+    def record_snapshot(self, snapshot: PriceSnapshot):
+        """Record an already timestamped price (e.g. from the market feed)."""
+        history = self._price_history.setdefault(snapshot.token_id, deque())
+        history.append(snapshot)
 
-        self._price_history[token_id].append(snapshot)
-
-        # Keep only recent history
-        cutoff = now - config.lookback_seconds
-        self._price_history[token_id] = [
-            s for s in self._price_history[token_id] if s.timestamp > cutoff
-        ]
+        # Keep only recent history (oldest snapshots are at the front)
+        cutoff = snapshot.timestamp - config.lookback_seconds
+        while history and history[0].timestamp <= cutoff:
+            history.popleft()
 
     def get_price_change(self, token_id: str) -> Optional[float]:
         """Calculate price change over lookback period."""
@@ -187,6 +483,12 @@ class PolymarketClient:
         price: float,
     ) -> Optional[str]:
         """Place a limit order."""
+        self._orderbook_cache.pop(token_id, None)
+
+        if not self.order_breaker.allow():
+            log.warning("Order placement paused after repeated failures")
+            return None
+
         try:
             order_args = OrderArgs(
                 token_id=token_id,
@@ -195,32 +497,41 @@ class PolymarketClient:
                 side=BUY if side == "buy" else "SELL",
             )
 
-            signed_order = self.clob_client.create_order(order_args)
-            response = self.clob_client.post_order(signed_order, OrderType.GTC)
+            def submit():
+                signed_order = self.clob_client.create_order(order_args)
+                return self.clob_client.post_order(signed_order, OrderType.GTC)
+
+            response = await self._call_clob(submit)
+
+            self.order_breaker.record_success()
 
             if response.get("success"):
                 return response.get("orderID")
             else:
-                print(f"Order failed: {response}")
+                log.error("Order failed: %s", response)
                 return None
 
         except Exception as e:
-            print(f"Error placing order: {e}")
+            log.error("Error placing order: %s", e)
+            self.order_breaker.record_failure()
             return None
 
     async def get_positions(self) -> list[dict]:
         """Get current open positions."""
         try:
-            return self.clob_client.get_positions() or []
+            return await self._call_clob(self.clob_client.get_positions) or []
         except Exception as e:
-            print(f"Error fetching positions: {e}")
+            log.error("Error fetching positions: %s", e)
             return []
 
-    async def cancel_order(self, order_id: str) -> bool:
+    async def cancel_order(self, order_id: str, token_id: Optional[str] = None) -> bool:
         """Cancel an order."""
+        if token_id:
+            self._orderbook_cache.pop(token_id, None)
+
         try:
-            self.clob_client.cancel(order_id)
+            await self._call_clob(self.clob_client.cancel, order_id)
             return True
         except Exception as e:
-            print(f"Error cancelling order: {e}")
+            log.error("Error cancelling order: %s", e)
             return False
@@ -1,5 +1,7 @@
 """Position and risk management."""
 
+import asyncio
+import logging
 import time
 from dataclasses import dataclass, field
 from typing import Optional
@@ -7,8 +9,10 @@ from typing import Optional
 from config import config
 from polymarket_client import PolymarketClient
 
+log = logging.getLogger("positions")
 
-@dataclass
+
+@dataclass(slots=True)
 class Position:
     """Tracks an open position."""
 
@@ -59,19 +63,28 @@ class PositionManager:
             order_id=order_id,
             current_price=entry_price,
         )
-        print(f"Opened position: {market_question[:50]}... @ {entry_price:.2f}")
+        log.info("Opened position: %.50s... @ %.2f", market_question, entry_price)
 
     async def update_positions(self):
         """Update current prices and PnL for all positions."""
-        for token_id, pos in list(self.positions.items()):
-            try:
-                current_price = await self.client.get_price(token_id)
-                pos.current_price = current_price
+        tokens = list(self.positions)
+        prices = await asyncio.gather(
+            *(self.client.get_price(t) for t in tokens), return_exceptions=True
+        )
+
+        for token_id, current_price in zip(tokens, prices):
+            if isinstance(current_price, Exception):
+                log.error("Error updating position %s: %s", token_id, current_price)
+                continue
+
+            # Position may have been closed while prices were fetched
+            pos = self.positions.get(token_id)
+            if pos is None:
+                continue
 
-                if pos.entry_price > 0:
-                    pos.pnl_pct = (current_price - pos.entry_price) / pos.entry_price
-            except Exception as e:
-                print(f"Error updating position {token_id}: {e}")
+            pos.current_price = current_price
+            if pos.entry_price > 0:
+                pos.pnl_pct = (current_price - pos.entry_price) / pos.entry_price
 
     async def check_exits(self) -> list[str]:
         """Check if any positions should be closed."""
@@ -80,18 +93,18 @@ class PositionManager:
         for token_id, pos in self.positions.items():
             # Take profit
             if pos.pnl_pct >= config.take_profit_pct:
-                print(
-                    f"Take profit triggered: {pos.market_question[:30]}... "
-                    f"PnL: {pos.pnl_pct:.1%}"
+                log.info(
+                    "Take profit triggered: %.30s... PnL: %.1f%%",
+                    pos.market_question, pos.pnl_pct * 100,
                 )
                 to_close.append(token_id)
                 continue
 
             # Stop loss
             if pos.pnl_pct <= -config.stop_loss_pct:
-                print(
-                    f"Stop loss triggered: {pos.market_question[:30]}... "
-                    f"PnL: {pos.pnl_pct:.1%}"
+                log.info(
+                    "Stop loss triggered: %.30s... PnL: %.1f%%",
+                    pos.market_question, pos.pnl_pct * 100,
                 )
                 to_close.append(token_id)
                 continue
@@ -102,9 +115,9 @@ class PositionManager:
         """Remove a position from tracking."""
         if token_id in self.positions:
             pos = self.positions.pop(token_id)
-            print(
-                f"Closed position: {pos.market_question[:30]}... "
-                f"Final PnL: {pos.pnl_pct:.1%}"
+            log.info(
+                "Closed position: %.30s... Final PnL: %.1f%%",
+                pos.market_question, pos.pnl_pct * 100,
             )
             return pos
         return None
@@ -114,24 +127,25 @@ class PositionManager:
         return sum(p.size for p in self.positions.values())
 
     def print_status(self):
-        """Print current positions status."""
+        """Log current positions status."""
         if not self.positions:
-            print("No open positions")
+            log.info("No open positions")
             return
 
-        print(f"\n{'='*60}")
-        print(f"Open Positions ({len(self.positions)}/{config.max_open_positions})")
-        print(f"{'='*60}")
+        log.info("=" * 60)
+        log.info("Open Positions (%d/%d)", len(self.positions), config.max_open_positions)
+        log.info("=" * 60)
 
+        now = time.time()
         for pos in self.positions.values():
-            age_mins = (time.time() - pos.entry_time) / 60
-            print(
-                f"  {pos.market_question[:40]}...\n"
-                f"    Entry: {pos.entry_price:.2f} | "
-                f"Current: {pos.current_price:.2f} | "
-                f"PnL: {pos.pnl_pct:+.1%} | "
-                f"Age: {age_mins:.0f}m"
+            log.info("  %.40s...", pos.market_question)
+            log.info(
+                "    Entry: %.2f | Current: %.2f | PnL: %+.1f%% | Age: %.0fm",
+                pos.entry_price,
+                pos.current_price,
+                pos.pnl_pct * 100,
+                (now - pos.entry_time) / 60,
             )
 
-        print(f"Total exposure: ${self.get_total_exposure():.2f}")
-        print(f"{'='*60}\n")
+        log.info("Total exposure: $%.2f", self.get_total_exposure())
+        log.info("=" * 60)
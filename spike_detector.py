@@ -1,14 +1,29 @@
 """Detects price spikes in YES outcomes that present NO betting opportunities."""
 
+import bisect
 import time
 from dataclasses import dataclass
 from typing import Optional
 
-from config import config
-from polymarket_client import Market, PolymarketClient
-
+import numpy as np
 
-@dataclass
+from config import config
+from polymarket_client import Market, PolymarketClient, PriceSnapshot
+
+# Confidence score tables: a value's score is SCORES[i], where i is the
+# number of BINS at or below it (at or above it for NO price, where
+# cheaper is better)
+_SPIKE_BINS = (0.20, 0.30)
+_SPIKE_SCORES = (0.2, 0.3, 0.4)
+# The min_liquidity tier only exists below $5000 - a higher setting
+# collapses it, as the bins must stay sorted for bisect
+_LIQUIDITY_BINS = (min(config.min_liquidity, 5000), 5000, 10000)
+_LIQUIDITY_SCORES = (0.0, 0.1, 0.2, 0.3)
+_NO_PRICE_BINS = (0.30, 0.50)
+_NO_PRICE_SCORES = (0.3, 0.2, 0.1)
+
+
+@dataclass(slots=True)
 class SpikeSignal:
     """Represents a detected price spike opportunity."""
 
@@ -27,46 +42,79 @@ class SpikeDetector:
 
     def __init__(self, client: PolymarketClient):
         self.client = client
-        self._baseline_prices: dict[str, float] = {}
+
+        # Baselines stored as one array (NaN = no baseline yet), with
+        # token_id -> row index, so scans can work on whole arrays
+        self._index: dict[str, int] = {}
+        self._baselines = np.full(256, np.nan)
         self._last_spike_time: dict[str, float] = {}
         self._cooldown_seconds = 300  # 5 min cooldown per market
 
+    def _rows(self, token_ids: list[str]) -> np.ndarray:
+        """Map token ids to baseline rows, allocating rows for new tokens."""
+        for token_id in token_ids:
+            if token_id not in self._index:
+                self._index[token_id] = len(self._index)
+
+        if len(self._index) > len(self._baselines):
+            grown = np.full(max(2 * len(self._baselines), len(self._index)), np.nan)
+            grown[: len(self._baselines)] = self._baselines
+            self._baselines = grown
+
+        return np.fromiter(
+            (self._index[t] for t in token_ids), dtype=np.intp, count=len(token_ids)
+        )
+
+    def _baseline(self, token_id: str) -> Optional[float]:
+        """Current baseline for a token, if we have one."""
+        row = self._index.get(token_id)
+        if row is None or np.isnan(self._baselines[row]):
+            return None
+        return float(self._baselines[row])
+
     async def update_baselines(self, markets: list[Market]):
         """Update baseline prices for markets we're tracking."""
+        if not markets:
+            return
+
+        rows = self._rows([m.token_id_yes for m in markets])
+        # Last trade price (from Gamma or the feed's trade events), never
+        # the orderbook mid
+        prices = np.fromiter((m.price_yes for m in markets), dtype=np.float64, count=len(markets))
+
+        # New tokens start at the current price, the rest slowly
+        # adjust using EMA
+        alpha = 0.1
+        old = self._baselines[rows]
+        self._baselines[rows] = np.where(
+            np.isnan(old), prices, alpha * prices + (1 - alpha) * old
+        )
+
+        # Record for history tracking
         for market in markets:
-            token_id = market.token_id_yes
-            # Use API price (last trade price) not orderbook mid
-            current_price = market.price_yes
-
-            # Only update baseline if price is "normal" (not already spiked)
-            if token_id not in self._baseline_prices:
-                self._baseline_prices[token_id] = current_price
-            else:
-                # Slowly adjust baseline using EMA
-                alpha = 0.1
-                old_baseline = self._baseline_prices[token_id]
-                self._baseline_prices[token_id] = (
-                    alpha * current_price + (1 - alpha) * old_baseline
-                )
-
-            # Record for history tracking
-            self.client.record_price(token_id, current_price)
-
-    async def detect_spike(self, market: Market) -> Optional[SpikeSignal]:
+            self.client.record_price(market.token_id_yes, market.price_yes)
+
+    async def detect_spike(
+        self,
+        market: Market,
+        now: Optional[float] = None,
+    ) -> Optional[SpikeSignal]:
         """Check if a market has a YES spike worth betting against."""
         token_id = market.token_id_yes
-        now = time.time()
+        if now is None:
+            now = time.time()
 
         # Check cooldown
         last_spike = self._last_spike_time.get(token_id, 0)
         if now - last_spike < self._cooldown_seconds:
             return None
 
-        # Get current YES price from API (not orderbook mid)
+        # Latest YES last trade price (not orderbook mid) - check_single
+        # only ever sets it from trade events
         current_yes_price = market.price_yes
 
         # Get baseline (or use stored price from earlier)
-        baseline = self._baseline_prices.get(token_id)
+        baseline = self._baseline(token_id)
         if baseline is None:
             return None
 
@@ -112,6 +160,22 @@ class SpikeDetector:
             confidence=confidence,
         )
 
+    async def check_single(
+        self,
+        market: Market,
+        update: PriceSnapshot,
+    ) -> Optional[SpikeSignal]:
+        """Check one market for a spike after a live trade price update."""
+        if market.liquidity < config.min_liquidity:
+            return None
+
+        market.price_yes = update.price
+        # The feed already timestamped this update - reuse it rather than
+        # reading the clock again
+        self.client.record_snapshot(update)
+
+        return await self.detect_spike(market, now=update.timestamp)
+
     def _calculate_confidence(
         self,
         spike_pct: float,
@@ -119,63 +183,13 @@ class SpikeDetector:
         no_price: float,
     ) -> float:
         """Calculate confidence score for the signal."""
-        score = 0.0
-
         # Higher spike = higher confidence (up to a point)
-        if spike_pct >= 0.30:
-            score += 0.4
-        elif spike_pct >= 0.20:
-            score += 0.3
-        else:
-            score += 0.2
+        score = _SPIKE_SCORES[bisect.bisect_right(_SPIKE_BINS, spike_pct)]
 
         # Better liquidity = higher confidence
-        if liquidity >= 10000:
-            score += 0.3
-        elif liquidity >= 5000:
-            score += 0.2
-        elif liquidity >= config.min_liquidity:
-            score += 0.1
+        score += _LIQUIDITY_SCORES[bisect.bisect_right(_LIQUIDITY_BINS, liquidity)]
 
         # NO price attractiveness (cheaper NO = better risk/reward)
-        if no_price <= 0.30:
-            score += 0.3
-        elif no_price <= 0.50:
-            score += 0.2
-        else:
-            score += 0.1
+        score += _NO_PRICE_SCORES[bisect.bisect_left(_NO_PRICE_BINS, no_price)]
 
         return min(score, 1.0)
-
-    async def scan_markets(self, markets: list[Market], debug: bool = True) -> list[SpikeSignal]:
-        """Scan all markets for spike opportunities."""
-        signals = []
-        price_changes = []
-
-        # Filter for markets with sufficient liquidity
-        tradeable = [m for m in markets if m.liquidity >= config.min_liquidity]
-
-        for market in tradeable:
-            # Track price changes for debug using API price
-            token_id = market.token_id_yes
-            baseline = self._baseline_prices.get(token_id)
-            if baseline and baseline > 0:
-                current = market.price_yes
-                change = (current - baseline) / baseline
-                price_changes.append((market.question[:40], change, current, baseline))
-
-            signal = await self.detect_spike(market)
-            if signal:
-                signals.append(signal)
-
-        # Print top movers for debug
-        if debug and price_changes:
-            price_changes.sort(key=lambda x: abs(x[1]), reverse=True)
-            print(f"  Top movers (threshold: {config.min_spike_threshold:.0%}):")
-            for q, change, curr, base in price_changes[:3]:
-                print(f"    {change:+.1%} | {q}... (now:{curr:.2f} base:{base:.2f})")
-
-        # Sort by confidence
-        signals.sort(key=lambda s: s.confidence, reverse=True)
-
-        return signals
@@ -1,14 +1,28 @@
 """Mean reversion strategy - bet NO when YES spikes."""
 
+import bisect
+import functools
+import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
 
 from config import config
+from metrics import SignalOutcome
 from spike_detector import SpikeSignal
 from orderbook import OrderbookAnalysis, OrderbookAnalyzer, SmartOrderParams
 
+log = logging.getLogger("strategy")
 
-@dataclass
+# Position size multiplier by spike magnitude: a spike's multiplier is
+# MULTS[i], where i is the number of BINS at or below it (bigger spike =
+# more confident in reversion)
+_SIZE_SPIKE_BINS = (0.25, 0.30)
+_SIZE_SPIKE_MULTS = (0.6, 0.8, 1.0)
+
+
+@dataclass(slots=True, frozen=True)
 class TradeDecision:
     """Decision to place a trade."""
 
@@ -19,6 +33,7 @@ class TradeDecision:
     limit_price: float
     reason: str
     order_params: Optional[SmartOrderParams] = None
+    skip_reason: Optional[SignalOutcome] = None  # Set when size is 0
 
 
 class MeanReversionStrategy:
@@ -33,7 +48,44 @@ class MeanReversionStrategy:
         self.min_confidence = 0.5
         self.min_no_price = 0.10  # Don't buy NO if it's too cheap (already priced in)
         self.max_no_price = 0.70  # Don't buy NO if YES hasn't actually spiked much
-        self.orderbook_analyzer = OrderbookAnalyzer()
+        self.max_position_size = config.max_position_size
+        self.min_size = 10.0  # At least $10 per order
+        self.limit_offset = 0.02  # Pay up to 2c over the NO price
+        self.max_limit_price = 0.95
+
+        # Smart order errors logged per second, so a malformed book feed
+        # can't flood the log
+        self.max_errors_per_second = 5
+        self._error_window_start = 0.0
+        self._errors_in_window = 0
+
+        # Latest analysis per token: token_id -> (orderbook, analysis).
+        # Holding the book keeps its identity valid as the cache key
+        self._analysis_cache: OrderedDict[str, tuple[dict, OrderbookAnalysis]] = OrderedDict()
+        self._analysis_cache_size = 128
+
+    @functools.cached_property
+    def orderbook_analyzer(self) -> OrderbookAnalyzer:
+        """Created on first use - only smart order placement needs it."""
+        return OrderbookAnalyzer()
+
+    def analyze_orderbook(self, token_id: str, orderbook: dict) -> OrderbookAnalysis:
+        """Analyze a token's orderbook, reusing the result for the same book.
+
+        Fetched books are shared dicts until refetched, and live books
+        are rendered fresh each time, so the same dict means the same book.
+        """
+        cached = self._analysis_cache.get(token_id)
+        if cached is not None and cached[0] is orderbook:
+            self._analysis_cache.move_to_end(token_id)
+            return cached[1]
+
+        analysis = self.orderbook_analyzer.analyze(orderbook)
+        self._analysis_cache[token_id] = (orderbook, analysis)
+        self._analysis_cache.move_to_end(token_id)
+        if len(self._analysis_cache) > self._analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+        return analysis
 
     def evaluate(
         self,
@@ -55,6 +107,7 @@ class MeanReversionStrategy:
                 size=0,
                 limit_price=0,
                 reason=f"NO price too low ({signal.no_price:.2f}), likely already priced in",
+                skip_reason=SignalOutcome.SKIPPED_PRICE_BOUNDS,
             )
 
         if signal.no_price > self.max_no_price:
@@ -65,6 +118,7 @@ class MeanReversionStrategy:
                 size=0,
                 limit_price=0,
                 reason=f"NO price too high ({signal.no_price:.2f}), YES hasn't spiked enough",
+                skip_reason=SignalOutcome.SKIPPED_PRICE_BOUNDS,
             )
 
         # Calculate base position size
@@ -90,7 +144,9 @@ class MeanReversionStrategy:
                 )
 
         # Fallback: simple order placement
-        limit_price = min(signal.no_price + 0.02, 0.95)
+        limit_price = signal.no_price + self.limit_offset
+        if limit_price > self.max_limit_price:
+            limit_price = self.max_limit_price
 
         return TradeDecision(
             signal=signal,
@@ -108,10 +164,8 @@ class MeanReversionStrategy:
         target_size: float,
     ) -> Optional[SmartOrderParams]:
         """Use orderbook analysis to determine optimal order placement."""
-        import time
-
         try:
-            analysis = self.orderbook_analyzer.analyze(orderbook)
+            analysis = self.analyze_orderbook(signal.token_id_no, orderbook)
 
             # Time since spike was detected
             time_since_spike = time.time() - signal.timestamp
@@ -128,28 +182,34 @@ class MeanReversionStrategy:
             if analysis.is_thin:
                 # Reduce size on thin books to avoid impact
                 params.size = min(params.size, analysis.bid_depth_1pct * 0.3)
-                params.size = max(params.size, 10.0)  # Still at least $10
+                if params.size < self.min_size:
+                    params.size = self.min_size  # Still at least $10
 
             return params
 
-        except Exception as e:
-            print(f"Error in smart order placement: {e}")
+        except (KeyError, TypeError, ValueError) as e:
+            # Malformed book levels - fall back to simple order placement
+            self._log_error("Error in smart order placement: %s", e)
             return None
 
+    def _log_error(self, msg: str, *args):
+        """Log an error, dropping any beyond the per-second limit."""
+        now = time.monotonic()
+        if now - self._error_window_start >= 1.0:
+            self._error_window_start = now
+            self._errors_in_window = 0
+
+        self._errors_in_window += 1
+        if self._errors_in_window <= self.max_errors_per_second:
+            log.exception(msg, *args)
+
     def _calculate_size(self, signal: SpikeSignal) -> float:
         """Calculate position size based on signal strength."""
-        base_size = config.max_position_size
-
         # Scale by confidence
-        size = base_size * signal.confidence
+        size = self.max_position_size * signal.confidence
 
-        # Scale by spike magnitude (bigger spike = more confident in reversion)
-        if signal.spike_pct >= 0.30:
-            size *= 1.0
-        elif signal.spike_pct >= 0.25:
-            size *= 0.8
-        else:
-            size *= 0.6
+        # Scale by spike magnitude
+        size *= _SIZE_SPIKE_MULTS[bisect.bisect_right(_SIZE_SPIKE_BINS, signal.spike_pct)]
 
         # Ensure minimum viable size
-        return max(size, 10.0)  # At least $10
+        return size if size > self.min_size else self.min_size